@@ -1,14 +1,25 @@
 # main.py
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
+from typing import List
+import asyncio
 import os
+import orjson
 
 from multiagent import MessageBus
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 message_bus = MessageBus()
 
+@app.on_event("startup")
+async def start_message_bus():
+    await message_bus.start()
+
+@app.on_event("shutdown")
+async def stop_message_bus():
+    await message_bus.stop()
+
 # Get the absolute path to the static directory
 static_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
 
@@ -20,13 +31,19 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 async def get():
     return FileResponse(os.path.join(static_dir, "index.html"))
 
+# Submit several messages in one request and route them concurrently
+@app.post("/api/messages/batch")
+async def post_messages_batch(messages: List[dict]):
+    await asyncio.gather(*(message_bus.route_message(m) for m in messages))
+    return {"status": "ok", "count": len(messages)}
+
 # WebSocket endpoint
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await message_bus.connect(websocket)
     try:
         while True:
-            data = await websocket.receive_json()
+            data = orjson.loads(await websocket.receive_text())
             await message_bus.route_message(data)
     except WebSocketDisconnect:
         message_bus.disconnect(websocket)
\ No newline at end of file
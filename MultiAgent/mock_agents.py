@@ -1,3 +1,5 @@
+import copy
+import functools
 import json
 import os
 import subprocess
@@ -10,25 +12,87 @@ AGENT1_DIR = os.path.join(BASE_DIR, "Agent_1")
 DATA_VALIDATION_DIR = os.path.join(BASE_DIR, "data-validation")
 VIZ_AGENT_DIR = os.path.join(BASE_DIR, "viz-agent")
 
+def _load_reference_demo():
+    """Load the sample visualization shipped with the demo, if present"""
+    try:
+        with open(os.path.join(BASE_DIR, 'MultiAgent/reference_demo.svg'), 'r') as f:
+            return f.read()
+    except OSError:
+        return None
+
+# Read once at import instead of on every visualization request
+_REFERENCE_DEMO_SVG = _load_reference_demo()
+
+# Predefined answers for the schema conversation demo
+_QUESTIONS = {
+    "What are the required fields in the event_trees section?": 
+        "The required fields in the event_trees section are: 'id', 'name', 'top_events', and 'sequences'.",
+    "How do I define a top event?": 
+        "To define a top event, create an object with 'id' and 'description' fields in the top_events array.",
+    "What is the purpose of node_substitutions?": 
+        "node_substitutions define the branching logic in the event tree, mapping node IDs to their corresponding substitution values.",
+    "Tell me about the basic event structure in SAPHIRE schema":
+        "Basic events in SAPHIRE represent the fundamental failure modes in a system. They contain fields such as: 'id' (unique identifier), 'name' (descriptive name), 'description' (detailed explanation), 'probability' (failure likelihood), and 'distribution' (uncertainty parameters).",
+    "What are fault trees in SAPHIRE?":
+        "Fault trees in SAPHIRE are logical representations of system failures. They contain a hierarchical structure of gates (AND, OR) connecting basic events to show how combinations of failures lead to system failure. Key components include 'id', 'name', 'description', 'gates', and 'basic_events'."
+}
+
+# Same answers keyed by the case-folded question, for lookups that differ only in case/whitespace
+_QUESTIONS_FOLDED = {question.casefold(): answer for question, answer in _QUESTIONS.items()}
+
+# Canned validation results for the data validation demo
+_NAMING_CONVENTION_RESULT = {
+    "valid": False,
+    "errors": [
+        "Basic event BE-PUMP-1 does not follow naming convention (should be BE_PUMP_1)",
+        "Gate G-SYSTEM-FAILURE uses hyphens instead of underscores",
+        "End state ES-01 is not descriptive enough"
+    ],
+    "message": "3 naming convention violations found"
+}
+
+_VALIDATION_PASSED_RESULT = {
+    "valid": True,
+    "message": "Schema validation passed successfully!",
+    "stats": {
+        "total_checks": 42,
+        "passed": 42,
+        "warnings": 0,
+        "errors": 0
+    }
+}
+
+_DEFAULT_VALIDATION_RESULT = {
+    "valid": True,
+    "message": "Your model has been validated against SAPHIRE schema requirements.",
+    "stats": {
+        "total_checks": 42,
+        "passed": 40,
+        "warnings": 2,
+        "errors": 0
+    }
+}
+
+# Checked in order; the first token found in the request picks the result
+_VALIDATION_HANDLERS = (
+    ("naming conventions", _NAMING_CONVENTION_RESULT),
+    ("validate", _VALIDATION_PASSED_RESULT),
+)
+
+@functools.lru_cache(maxsize=256)
+def _predefined_answer(folded_question):
+    """Predefined answer for a case-folded question, or None"""
+    return _QUESTIONS_FOLDED.get(folded_question)
+
 def process_schema_question(content):
     """Implementation that directly calls Agent_1 via command line"""
     # For demo purposes, return a predefined response
-    questions = {
-        "What are the required fields in the event_trees section?": 
-            "The required fields in the event_trees section are: 'id', 'name', 'top_events', and 'sequences'.",
-        "How do I define a top event?": 
-            "To define a top event, create an object with 'id' and 'description' fields in the top_events array.",
-        "What is the purpose of node_substitutions?": 
-            "node_substitutions define the branching logic in the event tree, mapping node IDs to their corresponding substitution values.",
-        "Tell me about the basic event structure in SAPHIRE schema":
-            "Basic events in SAPHIRE represent the fundamental failure modes in a system. They contain fields such as: 'id' (unique identifier), 'name' (descriptive name), 'description' (detailed explanation), 'probability' (failure likelihood), and 'distribution' (uncertainty parameters).",
-        "What are fault trees in SAPHIRE?":
-            "Fault trees in SAPHIRE are logical representations of system failures. They contain a hierarchical structure of gates (AND, OR) connecting basic events to show how combinations of failures lead to system failure. Key components include 'id', 'name', 'description', 'gates', and 'basic_events'."
-    }
-    
-    # If the question is in our predefined set, use that
-    if content in questions:
-        return questions[content]
+    # If the question is in our predefined set, use that. Only strings are
+    # looked up; other payloads (dicts, lists) fall through to the fallback.
+    if isinstance(content, str):
+        answer = _predefined_answer(content.strip().casefold())
+        if answer is not None:
+            return answer
     
     # Otherwise use our fallback
     return f"The schema defines the structure for SAPHIRE nuclear safety data. Your question was: '{content}'. In the full implementation, this would connect to Agent_1."
@@ -37,41 +101,17 @@ def validate_model(content):
     """Implementation that directly calls data-validation via command line"""
     try:
         # For demo purposes, use predefined responses
-        if isinstance(content, str):
-            if "naming conventions" in content.lower():
-                return {
-                    "valid": False,
-                    "errors": [
-                        "Basic event BE-PUMP-1 does not follow naming convention (should be BE_PUMP_1)",
-                        "Gate G-SYSTEM-FAILURE uses hyphens instead of underscores",
-                        "End state ES-01 is not descriptive enough"
-                    ],
-                    "message": "3 naming convention violations found"
-                }
-            
-            if "validate" in content.lower():
-                return {
-                    "valid": True,
-                    "message": "Schema validation passed successfully!",
-                    "stats": {
-                        "total_checks": 42,
-                        "passed": 42,
-                        "warnings": 0,
-                        "errors": 0
-                    }
-                }
-        
-        # Return a sample validation response
-        return {
-            "valid": True,
-            "message": "Your model has been validated against SAPHIRE schema requirements.",
-            "stats": {
-                "total_checks": 42,
-                "passed": 40,
-                "warnings": 2,
-                "errors": 0
-            }
-        }
+        lc = content.casefold() if isinstance(content, str) else ""
+        # Fall back to a sample validation response
+        result = _DEFAULT_VALIDATION_RESULT
+        for token, candidate in _VALIDATION_HANDLERS:
+            if token in lc:
+                result = candidate
+                break
+        
+        # Hand out a copy (the results nest lists and dicts) so a caller
+        # changing its response can't alter the shared tables
+        return copy.deepcopy(result)
     except Exception as e:
         return {"valid": False, "errors": [str(e)]}
 
@@ -84,17 +124,12 @@ def render_component(content):
         return render_fault_tree()
     else:
         # In full implementation, this would call viz-agent
-        try:
-            # Load the sample visualization from file (for demo)
-            with open(os.path.join(BASE_DIR, 'MultiAgent/reference_demo.svg'), 'r') as f:
-                svg = f.read()
-                return svg
-        except:
-            return render_generic_diagram(content)
+        if _REFERENCE_DEMO_SVG is not None:
+            return _REFERENCE_DEMO_SVG
+        return render_generic_diagram(content)
 
-def render_event_tree():
-    """Render a sample event tree diagram"""
-    svg = '''
+# Sample event tree diagram, built once at import
+_EVENT_TREE_SVG = '''
     <svg width="800" height="400" xmlns="http://www.w3.org/2000/svg">
         <style>
             .node { fill: #f0f8ff; stroke: #333; stroke-width: 2px; }
@@ -151,11 +186,13 @@ def render_event_tree():
         <text x="800" y="325" text-anchor="middle" class="text">CD-EARLY</text>
     </svg>
     '''
-    return svg
 
-def render_fault_tree():
-    """Render a sample fault tree diagram"""
-    svg = '''
+def render_event_tree():
+    """Render a sample event tree diagram"""
+    return _EVENT_TREE_SVG
+
+# Sample fault tree diagram, built once at import
+_FAULT_TREE_SVG = '''
     <svg width="800" height="500" xmlns="http://www.w3.org/2000/svg">
         <style>
             .node { fill: #f0f8ff; stroke: #333; stroke-width: 2px; }
@@ -219,7 +256,10 @@ def render_fault_tree():
         <line x1="650" y1="230" x2="650" y2="240" class="line" />
     </svg>
     '''
-    return svg
+
+def render_fault_tree():
+    """Render a sample fault tree diagram"""
+    return _FAULT_TREE_SVG
 
 def render_generic_diagram(content):
     """Render a generic diagram based on the content"""
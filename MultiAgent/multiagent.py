@@ -2,23 +2,90 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 import asyncio
+import collections
+from datetime import datetime
 import json
+import logging
+import orjson
 
 # Import mock agent functions
 from mock_agents import process_schema_question, validate_model, render_component
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of messages kept in the in-memory log
+MESSAGE_LOG_LIMIT = 10_000
+
+# Maximum number of responses waiting to be broadcast
+OUTBOX_LIMIT = 10_000
+
+# Response types whose (large) string content is sent as a binary frame:
+# a JSON header without "content", a newline, then the raw UTF-8 content
+BINARY_CONTENT_TYPES = {"visualization.response"}
+
 # Message routing and orchestration
 class MessageBus:
     def __init__(self):
-        self.active_connections = []
-        self.message_log = []
+        self.active_connections = set()
+        self.message_log = collections.deque(maxlen=MESSAGE_LOG_LIMIT)
+        # Message type -> (agent handler, response type)
+        self._routes = {
+            "schema.question": (process_schema_question, "schema.response"),        # Agent 1
+            "validation.request": (validate_model, "validation.response"),         # Agent 2
+            "visualization.request": (render_component, "visualization.response"),  # Agent 3
+        }
+        # Responses are queued here and broadcast by a background writer
+        self._outbox = None
+        self._writer_task = None
+    
+    async def start(self):
+        """Start the background writer; call once the event loop is running"""
+        self._outbox = asyncio.Queue(maxsize=OUTBOX_LIMIT)
+        self._writer_task = asyncio.create_task(self._writer_loop())
+    
+    async def stop(self):
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+    
+    async def _writer_loop(self):
+        while True:
+            message = await self._outbox.get()
+            try:
+                await self.broadcast(message)
+            except Exception:
+                # A message that can't be sent (e.g. content orjson can't
+                # serialize) must not stop delivery of the ones behind it
+                logger.exception("Failed to broadcast %s message", message.get("type"))
+            finally:
+                self._outbox.task_done()
+    
+    async def _enqueue(self, message: dict):
+        """Hand a response to the writer without waiting for the broadcast"""
+        if self._writer_task is None:
+            # Writer not running (e.g. used outside the app), send inline
+            await self.broadcast(message)
+            return
+        if self._writer_task.done():
+            # The writer only exits when stopped; if it died, start a new one
+            # so queued responses are not stranded in the outbox
+            self._writer_task = asyncio.create_task(self._writer_loop())
+        try:
+            self._outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            # Apply backpressure to the sender until the writer catches up
+            await self._outbox.put(message)
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
     
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
     
     async def broadcast(self, message: dict):
         # Log message
@@ -28,38 +95,42 @@ class MessageBus:
             "content": message.get("content")
         })
         
-        # Send to all clients
-        for connection in self.active_connections:
-            await connection.send_json(message)
+        # Serialize once and send to all clients in parallel so one slow socket
+        # doesn't hold up the rest
+        content = message.get("content")
+        if message.get("type") in BINARY_CONTENT_TYPES and isinstance(content, str):
+            header = orjson.dumps({k: v for k, v in message.items() if k != "content"})
+            payload = header + b"\n" + content.encode()
+            send = "send_bytes"
+        else:
+            payload = orjson.dumps(message).decode()
+            send = "send_text"
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(getattr(connection, send)(payload) for connection in connections),
+            return_exceptions=True
+        )
+
+        # Drop sockets that failed to receive the message
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.active_connections.discard(connection)
     
     async def route_message(self, message: dict):
         """Route message to appropriate agent and broadcast response"""
-        msg_type = message.get("type")
-        content = message.get("content")
-        
-        if msg_type == "schema.question":
-            # Route to Agent 1
-            response = process_schema_question(content)
-            await self.broadcast({
-                "type": "schema.response",
-                "content": response,
-                "timestamp": message.get("timestamp")
-            })
-            
-        elif msg_type == "validation.request":
-            # Route to Agent 2
-            results = validate_model(content)
-            await self.broadcast({
-                "type": "validation.response",
-                "content": results,
-                "timestamp": message.get("timestamp")
-            })
-            
-        elif msg_type == "visualization.request":
-            # Route to Agent 3
-            svg = render_component(content)
-            await self.broadcast({
-                "type": "visualization.response", 
-                "content": svg,
-                "timestamp": message.get("timestamp")
-            })
\ No newline at end of file
+        route = self._routes.get(message.get("type"))
+        if route is not None:
+            # Stamp the message once here rather than in each downstream step
+            timestamp = message.get("timestamp") or datetime.now().isoformat()
+            await self._dispatch(route, message, timestamp)
+    
+    async def _dispatch(self, route: tuple, message: dict, timestamp: str):
+        """Run the agent handler for a message and broadcast its response"""
+        handler, response_type = route
+        # Agents may block (e.g. shelling out), so keep them off the event loop
+        content = await asyncio.to_thread(handler, message.get("content"))
+        await self._enqueue({
+            "type": response_type,
+            "content": content,
+            "timestamp": timestamp
+        })
@@ -14,4 +14,4 @@ pip install -r requirements.txt
 
 # Start the application
 echo "Starting MultiAgent demo at http://localhost:8000"
-python -m uvicorn main:app --reload --host 0.0.0.0 --port 8000 
\ No newline at end of file
+python -m uvicorn main:app --reload --host 0.0.0.0 --port 8000 --loop uvloop 
\ No newline at end of file
@@ -6,10 +6,13 @@ function connectWebSocket() {
     // Use wss:// in production and ws:// in development
     const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
     ws = new WebSocket(`${protocol}//${window.location.host}/ws`);
+    ws.binaryType = 'arraybuffer';
     
     ws.onmessage = function(event) {
         try {
-            const message = JSON.parse(event.data);
+            const message = event.data instanceof ArrayBuffer
+                ? parseBinaryMessage(event.data)
+                : JSON.parse(event.data);
             handleMessage(message);
             console.log("Received message:", message);
         } catch (e) {
@@ -37,6 +40,16 @@ function connectWebSocket() {
     };
 }
 
+// Binary frames carry a JSON header line followed by the raw content
+function parseBinaryMessage(buffer) {
+    const bytes = new Uint8Array(buffer);
+    const split = bytes.indexOf(10); // '\n'
+    const decoder = new TextDecoder();
+    const message = JSON.parse(decoder.decode(bytes.subarray(0, split)));
+    message.content = decoder.decode(bytes.subarray(split + 1));
+    return message;
+}
+
 // Handle incoming messages
 function handleMessage(message) {
     if (!message) return;
@@ -0,0 +1,35 @@
+"""
+Tests for the mock agent handlers
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import mock_agents
+
+def test_schema_question_matches_case_and_whitespace_variants():
+    """Predefined answers are found regardless of case and surrounding whitespace"""
+    question = "How do I define a top event?"
+    expected = mock_agents._QUESTIONS[question]
+
+    assert mock_agents.process_schema_question(question) == expected
+    assert mock_agents.process_schema_question(f"  {question.upper()} ") == expected
+
+def test_schema_question_accepts_non_string_content():
+    """Dict and list payloads get the fallback answer instead of raising"""
+    for content in ({"question": "What are fault trees in SAPHIRE?"}, ["a", "b"]):
+        answer = mock_agents.process_schema_question(content)
+        assert "In the full implementation" in answer
+
+def test_validation_responses_are_independent():
+    """Changing one validation response doesn't affect the next one"""
+    for request in ("check naming conventions", "validate my model", "anything else"):
+        first = mock_agents.validate_model(request)
+        first["valid"] = None
+        first.get("errors", []).append("changed")
+        first.get("stats", {})["passed"] = -1
+
+        second = mock_agents.validate_model(request)
+        assert second["valid"] is not None
+        assert "changed" not in second.get("errors", [])
+        assert second.get("stats", {}).get("passed") != -1
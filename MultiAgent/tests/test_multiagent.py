@@ -0,0 +1,66 @@
+"""
+Tests for the MessageBus background writer
+"""
+import asyncio
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import orjson
+
+from multiagent import MessageBus
+
+class FakeWebSocket:
+    """Records the frames sent to it"""
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, payload):
+        self.sent.append(payload)
+
+    async def send_bytes(self, payload):
+        self.sent.append(payload)
+
+async def _broadcast_through_writer(messages):
+    """Queue messages on a started bus and return the socket once they are sent"""
+    bus = MessageBus()
+    websocket = FakeWebSocket()
+    bus.active_connections.add(websocket)
+    await bus.start()
+    try:
+        for message in messages:
+            await bus._enqueue(message)
+        await asyncio.wait_for(bus._outbox.join(), timeout=1)
+        return websocket
+    finally:
+        await bus.stop()
+
+def test_writer_survives_unserializable_message():
+    """A message orjson rejects is skipped and the next one is still delivered"""
+    bad = {"type": "schema.response", "content": 2 ** 70, "timestamp": "t0"}
+    good = {"type": "schema.response", "content": "ok", "timestamp": "t1"}
+
+    websocket = asyncio.run(_broadcast_through_writer([bad, good]))
+
+    assert [orjson.loads(payload) for payload in websocket.sent] == [good]
+
+def test_enqueue_restarts_dead_writer():
+    """Responses still go out if the writer task has exited"""
+    async def run():
+        bus = MessageBus()
+        websocket = FakeWebSocket()
+        bus.active_connections.add(websocket)
+        await bus.start()
+        try:
+            bus._writer_task.cancel()
+            await asyncio.sleep(0)
+            assert bus._writer_task.done()
+
+            await bus._enqueue({"type": "schema.response", "content": "ok", "timestamp": "t"})
+            await asyncio.wait_for(bus._outbox.join(), timeout=1)
+        finally:
+            await bus.stop()
+        return websocket
+
+    websocket = asyncio.run(run())
+    assert len(websocket.sent) == 1
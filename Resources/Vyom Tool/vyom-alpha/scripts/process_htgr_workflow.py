@@ -14,6 +14,8 @@ Usage:
     python process_htgr_workflow.py
 """
 import os
+import re
+import itertools
 import sys
 import json
 import time
@@ -23,6 +25,8 @@ from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from rich.text import Text
+from rich.markup import escape
 # from rich.progress import Progress, SpinnerColumn, TextColumn  # Not needed for basic workflow
 
 # Configure logging
@@ -53,19 +57,49 @@ except ImportError:
 input_file = os.path.join(project_root, "data", "inputs", "HTGR_PRA_10162024_Final.zip")
 input_description = "HTGR PRA Sample (10162024_Final.zip)"
 
+# Number of rows shown in each text summary table
+SUMMARY_ROWS = 5
+
+# Lines of command output repeated in the error message when a command fails
+ERROR_TAIL_LINES = 20
+
+# Static markup is parsed once here; only the dynamic parts are added per run
+WORKFLOW_INTRO = Text.from_markup(
+    "[bold]HTGR PRA 6-Step Workflow Test[/bold]\n\n"
+    "Testing specific workflow as requested:\n"
+    "1. Import ZIP file\n"
+    "2. Get extraction status\n"
+    "3. Create SAPHIRE schema\n"
+    "4. Get schema generation status\n"
+    "5. Assess data completeness\n"
+    "6. Visualize schema"
+)
+SUMMARY_HEADING = Text.from_markup("[bold]Workflow Test Summary[/bold]\n")
+NEXT_STEPS_HEADING = Text.from_markup("\n\n[bold]Next Steps:[/bold]\n")
+FAULT_TREES_HEADING = Text.from_markup("\n[bold]Fault Trees Summary:[/bold]")
+EVENT_TREES_HEADING = Text.from_markup("\n[bold]Event Trees Summary:[/bold]")
+BASIC_EVENTS_HEADING = Text.from_markup("\n[bold]Basic Events Summary:[/bold]")
+
 def run_command(cmd, description, show_output=True):
-    """Run a command and return its output."""
+    """Run a command, streaming its output as it runs, and return its output."""
     if show_output:
         console.print(f"[dim]Running: {' '.join(cmd)}[/dim]")
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if show_output and result.stdout:
-        console.print(result.stdout)
+    # stderr is merged into stdout so both can be read live from one pipe
+    lines = []
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          text=True, bufsize=1) as proc:
+        for line in proc.stdout:
+            lines.append(line)
+            if show_output:
+                console.out(line, end="")
     
-    if result.returncode != 0:
-        console.print(f"[red]Error: {result.stderr}[/red]")
+    errors = ""
+    if proc.returncode != 0:
+        errors = "".join(lines[-ERROR_TAIL_LINES:])
+        console.print(f"[red]Error: {errors}[/red]")
     
-    return result.returncode == 0, result.stdout, result.stderr
+    return proc.returncode == 0, "".join(lines), errors
 
 def get_job_id_from_output(output):
     """Extract job ID from command output."""
@@ -74,6 +108,16 @@ def get_job_id_from_output(output):
             return line.split("Job ID:")[1].split("-")[0].strip()
     return None
 
+# Component count lines in `vyom show` output, e.g. "12 Fault Trees"
+COUNT_LINE_PATTERN = re.compile(r'^\s*(\d+)\s+(Fault Trees|Event Trees|Basic Events|End States)')
+FILES_PROCESSED_PATTERN = re.compile(r'Files processed:\s*(\d+)\s*$')
+COUNT_KEYS = {
+    "Fault Trees": "fault_trees",
+    "Event Trees": "event_trees",
+    "Basic Events": "basic_events",
+    "End States": "end_states"
+}
+
 def parse_file_counts(output):
     """Parse file counts from status output."""
     result = {
@@ -84,32 +128,15 @@ def parse_file_counts(output):
         "total_files": 0
     }
     
-    for line in output.strip().split("\n"):
-        if "Fault Trees" in line:
-            try:
-                result["fault_trees"] = int(line.split("Fault Trees")[0].strip())
-            except ValueError:
-                pass
-        elif "Event Trees" in line:
-            try:
-                result["event_trees"] = int(line.split("Event Trees")[0].strip())
-            except ValueError:
-                pass
-        elif "Basic Events" in line:
-            try:
-                result["basic_events"] = int(line.split("Basic Events")[0].strip())
-            except ValueError:
-                pass
-        elif "End States" in line:
-            try:
-                result["end_states"] = int(line.split("End States")[0].strip())
-            except ValueError:
-                pass
-        elif "Files processed:" in line:
-            try:
-                result["total_files"] = int(line.split("Files processed:")[1].strip())
-            except (ValueError, IndexError):
-                pass
+    for line in output.splitlines():
+        match = COUNT_LINE_PATTERN.match(line)
+        if match:
+            result[COUNT_KEYS[match.group(2)]] = int(match.group(1))
+            continue
+        
+        match = FILES_PROCESSED_PATTERN.search(line)
+        if match:
+            result["total_files"] = int(match.group(1))
     
     return result
 
@@ -225,11 +252,13 @@ def assess_data_quality(job_id):
             referenced_bes = set()
             for ft in components["Fault Trees"]:
                 gates = ft.get("gates", [])
-                for gate in gates:
-                    inputs = gate.get("inputs", [])
-                    for input_id in inputs:
-                        if not any(g.get("id") == input_id for g in gates):
-                            referenced_bes.add(input_id)
+                gate_ids = {g.get("id") for g in gates}
+                referenced_bes.update(
+                    input_id
+                    for gate in gates
+                    for input_id in gate.get("inputs", [])
+                    if input_id not in gate_ids
+                )
             
             missing_bes = referenced_bes - be_ids
             if missing_bes:
@@ -400,70 +429,82 @@ def visualize_schema(job_id):
             # Show fault tree summary
             fault_trees = saphire_data.get("fault_trees", [])
             if fault_trees:
-                console.print("\n[bold]Fault Trees Summary:[/bold]")
+                console.print(FAULT_TREES_HEADING)
                 ft_table = Table()
                 ft_table.add_column("ID", style="cyan")
                 ft_table.add_column("Name", style="green")
                 ft_table.add_column("Gates", style="yellow")
                 ft_table.add_column("Basic Events", style="magenta")
                 
-                for i, ft in enumerate(fault_trees[:5]):  # Show top 5
-                    ft_table.add_row(
+                rows = [
+                    (
                         ft.get("id", "Unknown"),
                         ft.get("name", "Unnamed"),
                         str(len(ft.get("gates", []))),
                         str(len(ft.get("basic_events", [])))
                     )
+                    for ft in itertools.islice(fault_trees, SUMMARY_ROWS)
+                ]
+                for row in rows:
+                    ft_table.add_row(*row)
                 
                 console.print(ft_table)
-                if len(fault_trees) > 5:
-                    console.print(f"\n[italic]... and {len(fault_trees) - 5} more fault trees[/italic]")
+                remaining = len(fault_trees) - SUMMARY_ROWS
+                if remaining > 0:
+                    console.print(f"\n[italic]... and {remaining} more fault trees[/italic]")
             else:
                 console.print("[yellow]No fault trees found to visualize[/yellow]")
             
             # Show event tree summary
             event_trees = saphire_data.get("event_trees", [])
             if event_trees:
-                console.print("\n[bold]Event Trees Summary:[/bold]")
+                console.print(EVENT_TREES_HEADING)
                 et_table = Table()
                 et_table.add_column("ID", style="cyan")
                 et_table.add_column("Name", style="green")
                 et_table.add_column("Init Event", style="yellow")
                 et_table.add_column("Sequences", style="magenta")
                 
-                for i, et in enumerate(event_trees[:5]):  # Show top 5
-                    et_table.add_row(
+                rows = [
+                    (
                         et.get("id", "Unknown"),
                         et.get("name", "Unnamed"),
                         et.get("initiating_event", "Unknown"),
                         str(len(et.get("sequences", [])))
                     )
+                    for et in itertools.islice(event_trees, SUMMARY_ROWS)
+                ]
+                for row in rows:
+                    et_table.add_row(*row)
                 
                 console.print(et_table)
-                if len(event_trees) > 5:
-                    console.print(f"\n[italic]... and {len(event_trees) - 5} more event trees[/italic]")
+                remaining = len(event_trees) - SUMMARY_ROWS
+                if remaining > 0:
+                    console.print(f"\n[italic]... and {remaining} more event trees[/italic]")
             else:
                 console.print("[yellow]No event trees found to visualize[/yellow]")
             
             # Show basic events summary
             basic_events = saphire_data.get("basic_events", [])
             if basic_events:
-                console.print("\n[bold]Basic Events Summary:[/bold]")
-                be_table = Table()
-                be_table.add_column("ID", style="cyan")
-                be_table.add_column("Name", style="green")
-                be_table.add_column("Probability", style="yellow")
-                
-                for i, be in enumerate(basic_events[:5]):  # Show top 5
-                    be_table.add_row(
+                console.print(BASIC_EVENTS_HEADING)
+                rows = [
+                    (
                         be.get("id", "Unknown"),
                         be.get("name", "Unnamed"),
                         str(be.get("probability", "N/A"))
                     )
-                
-                console.print(be_table)
-                if len(basic_events) > 5:
-                    console.print(f"\n[italic]... and {len(basic_events) - 5} more basic events[/italic]")
+                    for be in itertools.islice(basic_events, SUMMARY_ROWS)
+                ]
+                # A short fixed-style preview doesn't need a Table's layout
+                # pass; print it as one block of markup instead
+                console.print("\n".join(
+                    f"[cyan]{escape(be_id)}[/cyan]  [green]{escape(name)}[/green]  [yellow]{escape(probability)}[/yellow]"
+                    for be_id, name, probability in rows
+                ))
+                remaining = len(basic_events) - SUMMARY_ROWS
+                if remaining > 0:
+                    console.print(f"\n[italic]... and {remaining} more basic events[/italic]")
             else:
                 console.print("[yellow]No basic events found to visualize[/yellow]")
         except Exception as e:
@@ -478,18 +519,7 @@ def visualize_schema(job_id):
 
 def main():
     """Main function implementing the 6-step workflow."""
-    console.print(Panel(
-        "[bold]HTGR PRA 6-Step Workflow Test[/bold]\n\n"
-        "Testing specific workflow as requested:\n"
-        "1. Import ZIP file\n"
-        "2. Get extraction status\n"
-        "3. Create SAPHIRE schema\n" 
-        "4. Get schema generation status\n"
-        "5. Assess data completeness\n"
-        "6. Visualize schema",
-        title="Workflow Test", 
-        border_style="blue"
-    ))
+    console.print(Panel(WORKFLOW_INTRO, title="Workflow Test", border_style="blue"))
     
     # Step 1: Check if input file exists and process it
     console.print("\n[bold]Step 1: Importing ZIP file[/bold]")
@@ -538,18 +568,17 @@ def main():
     visualize_schema(job_id)
     
     # Final summary
-    console.print(Panel(
-        "[bold]Workflow Test Summary[/bold]\n"
+    summary = Text.assemble(
+        SUMMARY_HEADING,
         f"• Job ID: {job_id}\n"
         f"• ZIP file successfully imported: {'✓' if success else '✗'}\n"
-        f"• Schema quality: {quality_results.get('confidence', 'N/A')}% complete\n\n"
-        f"[bold]Next Steps:[/bold]\n"
+        f"• Schema quality: {quality_results.get('confidence', 'N/A')}% complete",
+        NEXT_STEPS_HEADING,
         f"• To view raw data: vyom explore {job_id}\n"
         f"• To convert to OpenPRA: vyom convert {job_id}\n"
-        f"• To export data: vyom export {job_id}",
-        title="Test Complete", 
-        border_style="green"
-    ))
+        f"• To export data: vyom export {job_id}"
+    )
+    console.print(Panel(summary, title="Test Complete", border_style="green"))
     
     return True
 
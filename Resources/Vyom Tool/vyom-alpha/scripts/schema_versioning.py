@@ -6,22 +6,75 @@ This script helps manage OpenPRA schema versions and migrations.
 
 Usage:
   python schema_versioning.py --info                     # Show schema version information
-  python schema_versioning.py --validate <file>          # Validate a file against the schema
+  python schema_versioning.py --validate <file>...       # Validate one or more files against the schema
   python schema_versioning.py --upgrade <file> <version> # Upgrade a file to a newer schema version
+  python schema_versioning.py --upgrade <file> <version> --verify  # Upgrade, then validate the result
   python schema_versioning.py --export <version>         # Export a specific schema version
 """
 import os
+import re
 import sys
-import json
 import argparse
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Tuple
 
 # Add the parent directory to the path so that we can import vyom
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
 from vyom.schema import openpra
+from vyom.jsonio import load_json, dump_json
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; without it files are always fully loaded
+    ijson = None
+
+# Supported versions in release order, for error messages
+SUPPORTED_VERSIONS_TEXT = ", ".join(openpra.get_schema_versions())
+
+# Bytes read from the start of a file when scanning for its version
+HEADER_SCAN_BYTES = 8192
+
+# Any "version" key, top-level or nested, whatever the type of its value. A
+# match only shows that a version is present somewhere; the top-level value
+# has to be read as JSON.
+VERSION_PATTERN = re.compile(rb'"version"\s*:')
+
+def read_header(file_path):
+    """Read up to HEADER_SCAN_BYTES from the start of a file"""
+    with open(file_path, 'rb') as f:
+        return f.read(HEADER_SCAN_BYTES)
+
+def lacks_version(head):
+    """
+    Check whether a header holds a whole file (it is shorter than
+    HEADER_SCAN_BYTES) with no "version" key anywhere in it.
+    
+    A False result says nothing about the top-level version, since the
+    pattern also matches nested "version" keys.
+    """
+    return len(head) < HEADER_SCAN_BYTES and VERSION_PATTERN.search(head) is None
+
+def peek_version(file_path):
+    """
+    Read the top-level "version" of a JSON file without loading the whole document.
+    
+    Returns None if ijson is unavailable or the version can't be found.
+    """
+    if ijson is None:
+        return None
+    
+    try:
+        with open(file_path, 'rb') as f:
+            for key, value in ijson.kvitems(f, ''):
+                if key == "version":
+                    return value
+    except Exception:
+        return None
+    return None
 
 def show_schema_info():
     """Display information about available schema versions"""
@@ -39,71 +92,125 @@ def show_schema_info():
         print(f"  Description: {info['description']}")
         print()
 
-def validate_file(file_path):
-    """Validate a file against the OpenPRA schema"""
+def validation_report(file_path: str) -> Tuple[bool, List[str]]:
+    """
+    Validate a file against the OpenPRA schema without printing anything.
+    
+    Returns:
+        tuple: (valid, lines of the report to print)
+    """
+    lines = []
     if not os.path.exists(file_path):
-        print(f"Error: File not found: {file_path}")
-        return False
+        lines.append(f"Error: File not found: {file_path}")
+        return False, lines
     
     try:
         data, success, message = openpra.load_from_file(file_path)
         
         if not success:
-            print(f"Validation failed: {message}")
+            lines.append(f"Validation failed: {message}")
             
             # Print more details about the schema validation
             if "version" in data:
                 version = data["version"]
-                print(f"File schema version: {version}")
+                lines.append(f"File schema version: {version}")
                 
-                if version in openpra.get_schema_versions():
-                    print("This is a supported schema version.")
-                    print("Use --upgrade to upgrade to a newer version if needed.")
+                if version in openpra.SUPPORTED_VERSIONS:
+                    lines.append("This is a supported schema version.")
+                    lines.append("Use --upgrade to upgrade to a newer version if needed.")
                 else:
-                    print(f"Warning: Unsupported schema version. Supported versions: {', '.join(openpra.get_schema_versions())}")
+                    lines.append(f"Warning: Unsupported schema version. Supported versions: {SUPPORTED_VERSIONS_TEXT}")
             else:
-                print("No schema version information found in the file.")
+                lines.append("No schema version information found in the file.")
             
-            return False
+            return False, lines
         
-        print(f"File is valid: {message}")
-        print(f"Schema version: {data['version']}")
+        lines.append(f"File is valid: {message}")
+        lines.append(f"Schema version: {data['version']}")
         
         # Print some summary information
         if "metadata" in data:
-            print("\nMetadata:")
-            print(f"  Title: {data['metadata'].get('title', 'N/A')}")
-            print(f"  Created: {data['metadata'].get('created_date', 'N/A')}")
-            print(f"  Schema version: {data['metadata'].get('schema_version', 'N/A')}")
+            lines.append("\nMetadata:")
+            lines.append(f"  Title: {data['metadata'].get('title', 'N/A')}")
+            lines.append(f"  Created: {data['metadata'].get('created_date', 'N/A')}")
+            lines.append(f"  Schema version: {data['metadata'].get('schema_version', 'N/A')}")
         
         if "models" in data:
-            print("\nModel Counts:")
-            print(f"  Fault Trees: {len(data['models'].get('fault_trees', []))}")
-            print(f"  Event Trees: {len(data['models'].get('event_trees', []))}")
-            print(f"  Basic Events: {len(data['models'].get('basic_events', []))}")
-            print(f"  End States: {len(data['models'].get('end_states', []))}")
+            lines.append("\nModel Counts:")
+            lines.append(f"  Fault Trees: {len(data['models'].get('fault_trees', []))}")
+            lines.append(f"  Event Trees: {len(data['models'].get('event_trees', []))}")
+            lines.append(f"  Basic Events: {len(data['models'].get('basic_events', []))}")
+            lines.append(f"  End States: {len(data['models'].get('end_states', []))}")
         
-        return True
+        return True, lines
     
     except Exception as e:
-        print(f"Error validating file: {str(e)}")
-        return False
+        lines.append(f"Error validating file: {str(e)}")
+        return False, lines
 
-def upgrade_file(file_path, target_version):
-    """Upgrade a file to a newer schema version"""
-    if not os.path.exists(file_path):
-        print(f"Error: File not found: {file_path}")
-        return False
+def validate_file(file_path: str) -> bool:
+    """Validate a file against the OpenPRA schema"""
+    valid, lines = validation_report(file_path)
+    print("\n".join(lines))
+    return valid
+
+def validate_files(file_paths: List[str]) -> bool:
+    """
+    Validate several files in parallel.
+    
+    Reports are printed in the order the files were given, each under its own
+    heading, once its validation has finished.
+    """
+    if len(file_paths) == 1:
+        return validate_file(file_paths[0])
+    
+    workers = min(len(file_paths), 32, (os.cpu_count() or 1) * 4)
+    all_valid = True
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for file_path, (valid, lines) in zip(file_paths, executor.map(validation_report, file_paths)):
+            print(f"== {file_path} ==")
+            print("\n".join(lines))
+            print()
+            all_valid = all_valid and valid
     
-    if target_version not in openpra.get_schema_versions():
+    return all_valid
+
+def upgrade_file(file_path: str, target_version: str, verify: bool = False) -> bool:
+    """
+    Upgrade a file to a newer schema version.
+    
+    The upgraded copy is only re-read and validated when verify is set.
+    """
+    if target_version not in openpra.SUPPORTED_VERSIONS:
         print(f"Error: Unsupported target version: {target_version}")
-        print(f"Supported versions: {', '.join(openpra.get_schema_versions())}")
+        print(f"Supported versions: {SUPPORTED_VERSIONS_TEXT}")
         return False
     
     try:
+        # Reject small files with no version at all before parsing them
+        try:
+            head = read_header(file_path)
+        except FileNotFoundError:
+            print(f"Error: File not found: {file_path}")
+            return False
+        if lacks_version(head):
+            print("Error: No version information found in the file.")
+            return False
+        
+        # For a large file, check the top-level version first so one that
+        # needs no upgrade, or can't be upgraded, is never fully parsed. A
+        # small file is cheaper to load once than to parse twice.
+        if len(head) == HEADER_SCAN_BYTES:
+            version = peek_version(file_path)
+            if version == target_version:
+                print(f"File is already at version {target_version}.")
+                return True
+            if version is not None and version not in openpra.SUPPORTED_VERSIONS:
+                print(f"Upgrade failed: Unknown source version: {version}")
+                return False
+        
         # Load the file
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = load_json(file_path)
         
         # Check if version information is present
         if "version" not in data:
@@ -128,15 +235,15 @@ def upgrade_file(file_path, target_version):
         base_name = os.path.splitext(file_path)[0]
         new_file_path = f"{base_name}_v{target_version}.json"
         
-        with open(new_file_path, 'w') as f:
-            json.dump(upgraded_data, f, indent=2)
+        dump_json(upgraded_data, new_file_path)
         
         print(f"Upgraded from version {current_version} to {target_version}")
         print(f"Saved to: {new_file_path}")
         
-        # Validate the upgraded file
-        print("\nValidating upgraded file:")
-        validate_file(new_file_path)
+        # Validate the upgraded file if asked to
+        if verify:
+            print("\nValidating upgraded file:")
+            validate_file(new_file_path)
         
         return True
     
@@ -149,9 +256,9 @@ def export_schema(version=None):
     if version is None:
         version = openpra.get_latest_schema_version()
     
-    if version not in openpra.get_schema_versions():
+    if version not in openpra.SUPPORTED_VERSIONS:
         print(f"Error: Unsupported version: {version}")
-        print(f"Supported versions: {', '.join(openpra.get_schema_versions())}")
+        print(f"Supported versions: {SUPPORTED_VERSIONS_TEXT}")
         return False
     
     try:
@@ -165,8 +272,7 @@ def export_schema(version=None):
         timestamp = datetime.datetime.now().strftime("%Y%m%d")
         file_path = os.path.join(exports_dir, f"openpra_schema_v{version}_{timestamp}.json")
         
-        with open(file_path, 'w') as f:
-            json.dump(schema, f, indent=2)
+        dump_json(schema, file_path)
         
         print(f"Exported schema version {version} to {file_path}")
         return True
@@ -182,18 +288,19 @@ def main():
     # Define mutually exclusive arguments
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--info", action="store_true", help="Show schema version information")
-    group.add_argument("--validate", metavar="FILE", help="Validate a file against the schema")
+    group.add_argument("--validate", nargs='+', metavar="FILE", help="Validate one or more files against the schema")
     group.add_argument("--upgrade", nargs=2, metavar=("FILE", "VERSION"), help="Upgrade a file to a newer schema version")
     group.add_argument("--export", nargs='?', const=None, metavar="VERSION", help="Export a specific schema version")
+    parser.add_argument("--verify", action="store_true", help="Validate the upgraded file after --upgrade")
     
     args = parser.parse_args()
     
     if args.info:
         show_schema_info()
     elif args.validate:
-        validate_file(args.validate)
+        validate_files(args.validate)
     elif args.upgrade:
-        upgrade_file(args.upgrade[0], args.upgrade[1])
+        upgrade_file(args.upgrade[0], args.upgrade[1], verify=args.verify)
     elif args.export is not None:
         export_schema(args.export)
     else:
@@ -12,6 +12,7 @@ import subprocess
 import json
 import shutil
 from pathlib import Path
+from click.testing import CliRunner
 
 # Add the parent directory to the path so we can import vyom
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -51,6 +52,24 @@ def run_command(command, description=None):
     return result
 
 
+def invoke_cli(args, description=None):
+    """Invoke the vyom CLI in this process and print its output."""
+    # Imported here so a broken install still lets the other checks run
+    from vyom.cli import cli
+    
+    if description:
+        print(f"\n> {description}")
+    
+    print(f"$ vyom {' '.join(args)}")
+    
+    result = CliRunner().invoke(cli, args)
+    
+    if result.output:
+        print(result.output)
+    
+    return result
+
+
 def test_cli_command_aliases():
     """Test that all CLI command aliases work correctly."""
     print_header("Testing CLI Command Aliases")
@@ -71,25 +90,23 @@ def test_cli_command_aliases():
     for cmd_name, alias in commands.items():
         print(f"\nTesting alias '{alias}' for command '{cmd_name}':")
         
-        # Get help for both the full command and the alias
-        full_cmd = f"{vyom_command} {cmd_name} --help"
-        alias_cmd = f"{vyom_command} {alias} --help"
-        
-        full_cmd_result = run_command(full_cmd, f"Testing full command: {cmd_name}")
-        alias_cmd_result = run_command(alias_cmd, f"Testing alias: {alias}")
+        # Get help for both the full command and the alias, in-process
+        # rather than starting a new interpreter for each
+        full_cmd_result = invoke_cli([cmd_name, '--help'], f"Testing full command: {cmd_name}")
+        alias_cmd_result = invoke_cli([alias, '--help'], f"Testing alias: {alias}")
         
         # Check that both return code 0 (success)
-        if full_cmd_result.returncode != 0:
-            print(f"Error: Full command '{full_cmd}' failed with return code {full_cmd_result.returncode}")
+        if full_cmd_result.exit_code != 0:
+            print(f"Error: Full command 'vyom {cmd_name} --help' failed with return code {full_cmd_result.exit_code}")
             return False
             
-        if alias_cmd_result.returncode != 0:
-            print(f"Error: Alias command '{alias_cmd}' failed with return code {alias_cmd_result.returncode}")
+        if alias_cmd_result.exit_code != 0:
+            print(f"Error: Alias command 'vyom {alias} --help' failed with return code {alias_cmd_result.exit_code}")
             return False
             
         # Check that the help output is similar for both
         # We don't check for exact equality because the command name might be different in the output
-        if len(full_cmd_result.stdout) < 10 or len(alias_cmd_result.stdout) < 10:
+        if len(full_cmd_result.output) < 10 or len(alias_cmd_result.output) < 10:
             print(f"Error: Help output is too short for {cmd_name} or its alias {alias}")
             return False
             
@@ -170,16 +187,14 @@ def test_help_and_version():
     print_header("Testing Help and Version Commands")
     
     # Test main help
-    cmd = f"{vyom_command} --help"
-    result = run_command(cmd, "Testing main help command")
-    if result.returncode != 0:
+    result = invoke_cli(['--help'], "Testing main help command")
+    if result.exit_code != 0:
         print("Error: Main help command failed")
         return False
     
     # Test version command
-    cmd = f"{vyom_command} --version"
-    result = run_command(cmd, "Testing version command")
-    if result.returncode != 0:
+    result = invoke_cli(['--version'], "Testing version command")
+    if result.exit_code != 0:
         print("Error: Version command failed")
         return False
     
@@ -1,5 +1,14 @@
+import os
+
 from setuptools import setup, find_packages
 
+# Set VYOM_MYPYC=1 to compile the schema module to a C extension with mypyc
+# (needs the "mypyc" extra); the pure-Python module is used otherwise
+ext_modules = []
+if os.environ.get("VYOM_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["vyom/schema/openpra.py"])
+
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
@@ -13,6 +22,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://nuclearlicensing.io/app",
     packages=find_packages(),
+    ext_modules=ext_modules,
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -21,9 +31,22 @@ setup(
     python_requires=">=3.7",
     install_requires=[
         "click>=8.0.0",
-        "duckdb>=0.7.0",
+        "duckdb>=0.8.0",
         "jsonpath-ng>=1.5.0",
     ],
+    extras_require={
+        "speedups": [
+            "ijson>=3.2.0",
+            "orjson>=3.9.0",
+        ],
+        "test": [
+            "pytest>=7.0",
+            "pytest-xdist>=3.0",
+        ],
+        "mypyc": [
+            "mypy[mypyc]>=1.0",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "vyom=vyom.cli:cli",
@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the extraction and parser tests.
+"""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+def write_test_zip(zip_path, files_dict, prefix="_Subs/"):
+    """Write a ZIP holding files_dict (name -> str or bytes) under prefix"""
+    # Build the archive in memory, uncompressed, and write it out once
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zip_file:
+        for filename, content in files_dict.items():
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            zip_file.writestr(f"{prefix}{filename}", content)
+
+    with open(zip_path, 'wb') as f:
+        f.write(buffer.getbuffer())
+
+    return zip_path
+
+
+class SharedTempDirTestCase(unittest.TestCase):
+    """Base class with one temporary directory per test class and a subdirectory per test"""
+
+    # Prefix for the class's temporary directory
+    temp_prefix = "vyom_test_"
+
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory shared by every test in the class"""
+        cls.temp_dir = tempfile.mkdtemp(prefix=cls.temp_prefix)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def setUp(self):
+        """Give each test its own subdirectory of the shared directory"""
+        self.test_data_dir = os.path.join(self.temp_dir, self.id())
+        os.makedirs(self.test_data_dir, exist_ok=True)
+
+    def create_test_etl_file(self, content, filename=".ETL"):
+        """Create a test ETL file with the given content"""
+        file_path = os.path.join(self.test_data_dir, filename)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return file_path
+
+    def create_test_zip(self, files_dict, zip_name="test_etl.zip"):
+        """Create a test ZIP file with the given files"""
+        return write_test_zip(os.path.join(self.test_data_dir, zip_name), files_dict)
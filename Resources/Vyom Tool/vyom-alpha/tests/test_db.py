@@ -19,12 +19,12 @@ def test_db_connection():
     assert conn is not None, "Connection should not be None"
     
     # Check if tables were created
-    tables = conn.execute("SHOW TABLES").fetchall()
-    table_names = [t[0] for t in tables]
+    count = conn.execute("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_name IN ('jobs', 'job_data', 'conversions')
+    """).fetchone()[0]
     
-    assert "jobs" in table_names, "jobs table should exist"
-    assert "job_data" in table_names, "job_data table should exist"
-    assert "conversions" in table_names, "conversions table should exist"
+    assert count == 3, "jobs, job_data and conversions tables should exist"
 
 def test_job_creation_and_retrieval():
     """Test creating and retrieving a job"""
@@ -96,6 +96,21 @@ def test_job_data_storage_and_retrieval():
     assert len(retrieved_data["files"]) == 2, "Updated files count should match"
     assert retrieved_data["metadata"]["total_files"] == 2, "Updated metadata should match"
 
+def test_job_data_reads_see_outside_writes():
+    """Test that job data reads see writes made by other connections"""
+    job_id = f"test_{uuid.uuid4()}"
+    db.create_job(job_id, "/path/to/test.zip")
+    db.save_job_data(job_id, {"metadata": {"total_files": 1}})
+    assert db.get_job_data(job_id)["metadata"]["total_files"] == 1
+    
+    # Write around this module, as a vyom subprocess would
+    conn = db.get_connection()
+    conn.execute("""
+        UPDATE job_data SET data = ? WHERE job_id = ?
+    """, (json.dumps({"metadata": {"total_files": 2}}), job_id))
+    
+    assert db.get_job_data(job_id)["metadata"]["total_files"] == 2, "Read should see the new data"
+
 def test_conversion_storage():
     """Test storing conversion data"""
     job_id = f"test_{uuid.uuid4()}"
@@ -136,6 +151,7 @@ if __name__ == "__main__":
         test_job_creation_and_retrieval()
         test_job_status_update()
         test_job_data_storage_and_retrieval()
+        test_job_data_reads_see_outside_writes()
         test_conversion_storage()
         print("All database tests passed!")
     finally:
@@ -2,14 +2,57 @@
 End-to-end test of the Vyom application
 """
 import os
-import json
+import re
 import tempfile
 import shutil
 import subprocess
 import sys
+from pathlib import Path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from click.testing import CliRunner
+
 from tests.test_saphire_extraction import create_test_zip
+from vyom.jsonio import load_json
+
+# "Job ID: <id> - Use this ID ..." from the import command
+JOB_ID_PATTERN = re.compile(r'Job ID:\s*([^\s-]+)')
+
+# "... File saved at <path>" from the view command
+VIZ_PATH_PATTERN = re.compile(r'File saved at\s*(.*\S)')
+
+# Markers the generated visualization HTML must contain, with what each shows
+VIZ_CONTENT_CHECKS = (
+    ('monaco-editor', "Monaco editor"),
+    ('comment-section', "comment section"),
+    ('json-panel', "JSON panel"),
+    # JavaScript code
+    ('currentSelectedPath', "currentSelectedPath variable"),
+    ('updateJsonEditor', "updateJsonEditor function"),
+    ("path || ''", "handling of an undefined path"),
+    # Error handling
+    ('try {', "error handling"),
+    ('catch (error)', "error catching"),
+    ('if (!Array.isArray(items))', "array input validation"),
+    ('console.error', "error logging"),
+    ('<div class="empty-state">Error loading data</div>', "error state"),
+    # Data loading
+    ('const saphireData = ', "SAPHIRE data loading"),
+    ('const jobId = ', "job ID loading"),
+    ('comments: ', "comments loading"),
+)
+
+def run_cli(args):
+    """Run a vyom CLI command in this process and return click's Result"""
+    # Imported here so an import failure is reported by the test, not at collection
+    from vyom.cli import cli
+    
+    print(f"Running command: vyom {' '.join(args)}")
+    return CliRunner().invoke(cli, args)
+
+def cli_error(result):
+    """Describe why an in-process CLI command failed"""
+    return result.output or repr(result.exception)
 
 def test_full_workflow(custom_zip_path=None):
     """Test the full workflow of the application
@@ -29,127 +72,104 @@ def test_full_workflow(custom_zip_path=None):
         print(f"Test ZIP file created at: {zip_path}")
     
     try:
-        # Build the command to import the ZIP file
-        import_cmd = [sys.executable, "-m", "vyom.cli", "import", zip_path]
-        print(f"Running command: {' '.join(import_cmd)}")
+        # Smoke-test the installed entry point once in a real subprocess; the
+        # remaining commands run in this process to skip interpreter start-up
+        help_cmd = [sys.executable, "-m", "vyom.cli", "--help"]
+        result = subprocess.run(help_cmd, capture_output=True)
+        # Output is only decoded if it's needed for the failure message
+        assert result.returncode == 0, f"CLI entry point failed: {result.stderr.decode(errors='replace')}"
         
         # Run the import command
-        result = subprocess.run(import_cmd, capture_output=True, text=True)
+        result = run_cli(["import", zip_path])
         
         # Check if the command was successful
-        assert result.returncode == 0, f"Import command failed: {result.stderr}"
+        assert result.exit_code == 0, f"Import command failed: {cli_error(result)}"
         print("Import command output:")
-        print(result.stdout)
+        print(result.output)
         
         # Extract the job ID from the output
-        output_lines = result.stdout.strip().split("\n")
-        job_id_line = next((line for line in output_lines if "Job ID:" in line), None)
-        assert job_id_line is not None, "Could not find job ID in output"
+        match = JOB_ID_PATTERN.search(result.output)
+        assert match is not None, "Could not find job ID in output"
         
-        job_id = job_id_line.split("Job ID:")[1].split("-")[0].strip()
+        job_id = match.group(1)
         print(f"Job ID: {job_id}")
         
         # Check the job status using explore command
-        explore_status_cmd = [sys.executable, "-m", "vyom.cli", "explore", job_id]
-        result = subprocess.run(explore_status_cmd, capture_output=True, text=True)
+        result = run_cli(["explore", job_id])
         
         # Check if the command was successful
-        assert result.returncode == 0, f"Explore command failed: {result.stderr}"
+        assert result.exit_code == 0, f"Explore command failed: {cli_error(result)}"
         print("Explore command output:")
-        print(result.stdout)
+        print(result.output)
         
         # Export the raw data
         export_path = os.path.join(temp_dir, "export.json")
-        export_cmd = [sys.executable, "-m", "vyom.cli", "explore", job_id, "--export", "-o", export_path]
-        result = subprocess.run(export_cmd, capture_output=True, text=True)
+        result = run_cli(["explore", job_id, "--export", "-o", export_path])
         
         # Check if the command was successful
-        assert result.returncode == 0, f"Export command failed: {result.stderr}"
+        assert result.exit_code == 0, f"Export command failed: {cli_error(result)}"
         assert os.path.exists(export_path), "Export file should exist"
         print(f"Data exported to: {export_path}")
         
         # Check the exported data
-        with open(export_path, 'r') as f:
-            export_data = json.load(f)
+        export_data = load_json(export_path)
         
         assert "files" in export_data, "Exported data should have files"
         assert "metadata" in export_data, "Exported data should have metadata"
         
         # Convert to OpenPRA format
         convert_path = os.path.join(temp_dir, "openpra.json")
-        convert_cmd = [sys.executable, "-m", "vyom.cli", "convert", job_id, "--output", convert_path]
-        result = subprocess.run(convert_cmd, capture_output=True, text=True)
+        result = run_cli(["convert", job_id, "--output", convert_path])
         
         # Check if the command was successful
-        assert result.returncode == 0, f"Convert command failed: {result.stderr}"
+        assert result.exit_code == 0, f"Convert command failed: {cli_error(result)}"
         assert os.path.exists(convert_path), "Convert file should exist"
         print(f"Data converted to: {convert_path}")
         
         # Check the converted data
-        with open(convert_path, 'r') as f:
-            openpra_data = json.load(f)
+        openpra_data = load_json(convert_path)
         
         assert "version" in openpra_data, "OpenPRA data should have version"
         assert "metadata" in openpra_data, "OpenPRA data should have metadata"
         assert "models" in openpra_data, "OpenPRA data should have models"
         
         # List all jobs
-        list_cmd = [sys.executable, "-m", "vyom.cli", "list"]
-        result = subprocess.run(list_cmd, capture_output=True, text=True)
+        result = run_cli(["list"])
         
         # Check if the command was successful
-        assert result.returncode == 0, f"List command failed: {result.stderr}"
-        assert job_id in result.stdout, "Job ID should be in the list output"
+        assert result.exit_code == 0, f"List command failed: {cli_error(result)}"
+        assert job_id in result.output, "Job ID should be in the list output"
         print("List command output:")
-        print(result.stdout)
+        print(result.output)
         
         # Try the visualization (if available)
         try:
             # Only run this test if the visualization functionality exists
             # Use --no-browser so it doesn't open a browser window during tests
-            view_cmd = [sys.executable, "-m", "vyom.cli", "view", job_id, "--no-browser"]
-            result = subprocess.run(view_cmd, capture_output=True, text=True)
+            result = run_cli(["view", job_id, "--no-browser"])
             
             # Check if the command was successful
-            if result.returncode == 0:
+            if result.exit_code == 0:
                 print("View command successful")
                 # Check for visualization output path
-                output_path_line = next((line for line in result.stdout.split("\n") 
-                                     if "File saved at" in line), None)
-                if output_path_line:
-                    viz_path = output_path_line.split("File saved at")[1].strip()
+                match = VIZ_PATH_PATTERN.search(result.output)
+                if match:
+                    viz_path = match.group(1)
                     assert os.path.exists(viz_path), "Visualization file should exist"
                     print(f"Visualization file created at: {viz_path}")
                     
                     # Verify the visualization file contains the expected content
-                    with open(viz_path, 'r') as f:
-                        content = f.read()
-                        assert 'monaco-editor' in content, "Visualization should include Monaco editor"
-                        assert 'comment-section' in content, "Visualization should include comment section"
-                        assert 'json-panel' in content, "Visualization should include JSON panel"
-                        
-                        # Verify JavaScript code
-                        assert 'currentSelectedPath' in content, "Visualization should include currentSelectedPath variable"
-                        assert 'updateJsonEditor' in content, "Visualization should include updateJsonEditor function"
-                        assert 'path || \'\'' in content, "Visualization should handle undefined path"
-                        
-                        # Verify error handling
-                        assert 'try {' in content, "Visualization should include error handling"
-                        assert 'catch (error)' in content, "Visualization should catch errors"
-                        assert 'if (!Array.isArray(items))' in content, "Visualization should validate array inputs"
-                        assert 'console.error' in content, "Visualization should log errors"
-                        assert '<div class="empty-state">Error loading data</div>' in content, "Visualization should show error state"
-                        
-                        # Verify data loading
-                        assert 'const saphireData = ' in content, "Visualization should load SAPHIRE data"
-                        assert 'const jobId = ' in content, "Visualization should load job ID"
-                        assert 'comments: ' in content, "Visualization should load comments"
-                        
-                        print("Visualization file content verified")
+                    content = Path(viz_path).read_text(encoding='utf-8')
+                    
+                    missing = [description for marker, description in VIZ_CONTENT_CHECKS
+                               if marker not in content]
+                    assert not missing, "Visualization is missing: " + "; ".join(missing)
+                    
+                    print("Visualization file content verified")
                 else:
                     print("View command output did not contain visualization file path")
             else:
-                print(f"View command failed: {result.stderr}")
+                print(f"View command failed: {cli_error(result)}")
         except Exception as e:
             print(f"View test error: {str(e)}")
         
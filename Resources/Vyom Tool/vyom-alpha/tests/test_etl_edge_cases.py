@@ -6,8 +6,6 @@ as potential problems, including BOM markers, tree boundaries, and malformed dat
 """
 import os
 import sys
-import tempfile
-import zipfile
 import unittest
 import logging
 from pathlib import Path
@@ -15,56 +13,19 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from vyom.schema.saphire import parse_etl_file
+from vyom.schema.saphire import parse_etl_file, parse_etl_stream
 from vyom.extractor import analyze_files, extract_zip
+from tests.helpers import SharedTempDirTestCase
 
 # Configure logging
 logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class TestETLEdgeCases(unittest.TestCase):
+class TestETLEdgeCases(SharedTempDirTestCase):
     """Test class for ETL parser edge cases"""
     
-    def setUp(self):
-        """Set up test environment"""
-        self.temp_dir = tempfile.mkdtemp(prefix="vyom_test_etl_edge_")
-        self.test_data_dir = os.path.join(self.temp_dir, "test_data")
-        os.makedirs(self.test_data_dir, exist_ok=True)
-    
-    def tearDown(self):
-        """Clean up after tests"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def create_test_etl_file(self, content, filename=".ETL"):
-        """Create a test ETL file with the given content"""
-        file_path = os.path.join(self.test_data_dir, filename)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return file_path
-    
-    def create_test_zip(self, files_dict):
-        """Create a test ZIP file with the given files"""
-        zip_path = os.path.join(self.temp_dir, "test_etl.zip")
-        
-        with zipfile.ZipFile(zip_path, 'w') as zip_file:
-            for filename, content in files_dict.items():
-                file_path = os.path.join(self.test_data_dir, filename)
-                
-                # Create the file
-                if isinstance(content, str):
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                else:
-                    with open(file_path, 'wb') as f:
-                        f.write(content)
-                
-                # Add to ZIP
-                arcname = os.path.join("_Subs", filename)
-                zip_file.write(file_path, arcname=arcname)
-        
-        return zip_path
+    temp_prefix = "vyom_test_etl_edge_"
     
     def test_bom_at_file_start(self):
         """Test ETL parser with BOM at file start"""
@@ -118,18 +79,22 @@ class TestETLEdgeCases(unittest.TestCase):
             "SG-LK-SMALL"
         ]
         
-        etl_content = '\ufeff'  # Start with BOM
+        parts = ['\ufeff']  # Start with BOM
         
         for i, tree_name in enumerate(trees):
             # Add tree definition
-            etl_content += f'HTGR_PRA, {tree_name}, IE-{tree_name} =\n'
-            etl_content += f'^TOPS\nTOP1_{tree_name}, TOP2_{tree_name}\n'
-            etl_content += f'^SEQUENCES\n*\nY, SEQ1_{tree_name}, , OK\nY, SEQ2_{tree_name}, , FAIL\n'
-            etl_content += f'^LOGIC\nSEQ1_{tree_name}, TOP1_{tree_name}\nSEQ2_{tree_name}, TOP2_{tree_name}\n'
+            parts.extend([
+                f'HTGR_PRA, {tree_name}, IE-{tree_name} =\n',
+                f'^TOPS\nTOP1_{tree_name}, TOP2_{tree_name}\n',
+                f'^SEQUENCES\n*\nY, SEQ1_{tree_name}, , OK\nY, SEQ2_{tree_name}, , FAIL\n',
+                f'^LOGIC\nSEQ1_{tree_name}, TOP1_{tree_name}\nSEQ2_{tree_name}, TOP2_{tree_name}\n',
+            ])
             
             # Add EOS and BOM except for the last tree
             if i < len(trees) - 1:
-                etl_content += '^EOS\n\ufeff'
+                parts.append('^EOS\n\ufeff')
+        
+        etl_content = ''.join(parts)
         
         # Parse the ETL content
         result = parse_etl_file(etl_content)
@@ -149,21 +114,39 @@ class TestETLEdgeCases(unittest.TestCase):
             self.assertEqual(len(tree['top_events']), 2)
             self.assertIn('sequences', tree)
             self.assertEqual(len(tree['sequences']), 2)
+        
+        # Streaming the same file in chunks should give the same result
+        etl_path = self.create_test_etl_file(etl_content)
+        with open(etl_path, 'r', encoding='utf-8') as f:
+            streamed = parse_etl_stream(iter(lambda: f.read(64 * 1024), ''))
+        self.assertEqual(streamed, result)
+    
+    def test_stream_markers_split_across_chunks(self):
+        """Test streamed ETL parsing when ^EOS markers and BOMs straddle chunk boundaries"""
+        etl_content = '\ufeffHTGR_PRA, TREE_1, IE-TREE_1 =\n^TOPS\nTOP1, TOP2\n^SEQUENCES\n*\nY, SEQ1, , OK\n^EOS\n'
+        etl_content += '\ufeffHTGR_PRA, TREE_2, IE-TREE_2 =\n^TOPS\nTOP1\n^SEQUENCES\n*\nY, SEQ2, , FAIL\n^LOGIC\nSEQ2, TOP1'
+        expected = parse_etl_file(etl_content)
+        
+        for size in (1, 2, 3, 5, 64):
+            chunks = [etl_content[i:i + size] for i in range(0, len(etl_content), size)]
+            self.assertEqual(parse_etl_stream(chunks), expected, f"chunk size {size}")
     
     def test_zip_extraction_bom(self):
         """Test extraction from a ZIP file with BOM characters"""
         # Create ETL content with BOM characters
-        etl_content = '\ufeff'  # Start with BOM
+        parts = ['\ufeff']  # Start with BOM
         
         # Add multiple trees with BOM characters between them
         for i in range(5):
             tree_name = f"TREE_{i}"
-            etl_content += f'HTGR_PRA, {tree_name}, IE-{tree_name} =\n'
-            etl_content += f'^TOPS\nTOP1, TOP2\n^SEQUENCES\n*\nY, SEQ1, , OK\n'
+            parts.append(f'HTGR_PRA, {tree_name}, IE-{tree_name} =\n')
+            parts.append('^TOPS\nTOP1, TOP2\n^SEQUENCES\n*\nY, SEQ1, , OK\n')
             
             # Add EOS and BOM except for the last tree
             if i < 4:
-                etl_content += '^EOS\n\ufeff'
+                parts.append('^EOS\n\ufeff')
+        
+        etl_content = ''.join(parts)
         
         # Create a ZIP with this content
         files = {".ETL": etl_content}
@@ -186,9 +169,11 @@ class TestETLEdgeCases(unittest.TestCase):
     def test_malformed_tree_headers(self):
         """Test ETL parser with malformed tree headers"""
         # Create content with various malformed headers
-        etl_content = 'HTGR_PRA, TREE_1 =\n^TOPS\nTOP1, TOP2\n^SEQUENCES\n*\nY, SEQ1, , OK\n^EOS\n'  # Missing IE part
-        etl_content += 'HTGR_PRA,TREE_2,IE-TREE_2 =\n^TOPS\nTOP1, TOP2\n^SEQUENCES\n*\nY, SEQ2, , OK\n^EOS\n'  # No spaces after commas
-        etl_content += 'HTGR_PRA, TREE_3, IE-TREE_3\n^TOPS\nTOP1, TOP2\n^SEQUENCES\n*\nY, SEQ3, , OK'  # Missing "=" at the end
+        etl_content = ''.join([
+            'HTGR_PRA, TREE_1 =\n^TOPS\nTOP1, TOP2\n^SEQUENCES\n*\nY, SEQ1, , OK\n^EOS\n',  # Missing IE part
+            'HTGR_PRA,TREE_2,IE-TREE_2 =\n^TOPS\nTOP1, TOP2\n^SEQUENCES\n*\nY, SEQ2, , OK\n^EOS\n',  # No spaces after commas
+            'HTGR_PRA, TREE_3, IE-TREE_3\n^TOPS\nTOP1, TOP2\n^SEQUENCES\n*\nY, SEQ3, , OK',  # Missing "=" at the end
+        ])
         
         result = parse_etl_file(etl_content)
         
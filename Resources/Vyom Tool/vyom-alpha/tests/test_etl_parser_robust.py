@@ -6,13 +6,11 @@ of the ETL parser in handling various file formats and edge cases.
 """
 import os
 import sys
-import tempfile
-import zipfile
 import random
 import string
-import io
-import json
+import functools
 import unittest
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -20,93 +18,115 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from vyom.schema.saphire import parse_etl_file
 from vyom.extractor import analyze_files, extract_zip
+from tests.helpers import SharedTempDirTestCase
 
-class TestETLParserRobust(unittest.TestCase):
-    """Test class for robust ETL parser testing"""
+@functools.lru_cache(maxsize=64)
+def minimal_etl_lines(num_trees, with_bom):
+    """Lines of a minimal ETL file with the given number of trees (cached)"""
+    content = []
     
-    def setUp(self):
-        """Set up test environment"""
-        self.temp_dir = tempfile.mkdtemp(prefix="vyom_test_etl_")
-        self.test_data_dir = os.path.join(self.temp_dir, "test_data")
-        os.makedirs(self.test_data_dir, exist_ok=True)
+    if with_bom:
+        content.append('\ufeff')  # Add BOM at start
     
-    def tearDown(self):
-        """Clean up after tests"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    for i in range(num_trees):
+        # Add tree header
+        content.append(f'HTGR_PRA, TREE_{i}, IE-TREE_{i} =')
+        
+        # Add tree content sections
+        content.append('^TOPS')
+        content.append(f'TOP_EVENT_{i}_1, TOP_EVENT_{i}_2')
+        
+        content.append('^SEQUENCES')
+        content.append('*')
+        content.append(f'Y, SEQ_{i}_1, , OK')
+        content.append(f'Y, SEQ_{i}_2, , FAIL')
+        
+        content.append('^LOGIC')
+        content.append(f'SEQ_{i}_1, TOP_EVENT_{i}_1')
+        content.append(f'SEQ_{i}_2, TOP_EVENT_{i}_2')
+        
+        # Add EOS marker for all but the last tree
+        if i < num_trees - 1:
+            content.append('^EOS')
+            if with_bom:
+                content.append('\ufeff')  # Add BOM after EOS
+    
+    return tuple(content)
+
+@functools.lru_cache(maxsize=64)
+def minimal_etl(num_trees, with_bom):
+    """A minimal, uncorrupted ETL file; the same text is reused across tests"""
+    return '\n'.join(minimal_etl_lines(num_trees, with_bom))
+
+# Seed for the fuzz corpus, so a failing input can be reproduced
+FUZZ_SEED = 0xC0FFEE
+
+# Number of random ETL files in the fuzz corpus
+FUZZ_CASES = 5
+
+def generate_fuzz_etl(rng):
+    """Generate random content with some SAPHIRE-like structure"""
+    lines = []
+    
+    # Randomly decide if it has a BOM
+    if rng.choice([True, False]):
+        lines.append('\ufeff')
+    
+    # Add some random tree structure
+    num_trees = rng.randint(1, 5)
+    
+    for i in range(num_trees):
+        # Random tree name
+        tree_name = ''.join(rng.choice(string.ascii_uppercase) for _ in range(8))
+        lines.append(f'HTGR_PRA, {tree_name}, IE-{tree_name} =')
+        
+        # Add random sections
+        for section in ['^TOPS', '^SEQUENCES', '^LOGIC', '^TEXT', '^NODESUBS']:
+            if rng.choice([True, False]):
+                lines.append(section)
+                # Add some random content for this section
+                num_lines = rng.randint(1, 5)
+                for _ in range(num_lines):
+                    lines.append(''.join(rng.choice(string.printable) for _ in range(20)))
+        
+        # Add EOS marker except for last tree
+        if i < num_trees - 1:
+            lines.append('^EOS')
+            # Maybe add BOM after EOS
+            if rng.choice([True, False]):
+                lines.append('\ufeff')
+    
+    return '\n'.join(lines)
+
+@functools.lru_cache(maxsize=1)
+def fuzz_corpus():
+    """The fuzz inputs, generated once from FUZZ_SEED"""
+    rng = random.Random(FUZZ_SEED)
+    return tuple(generate_fuzz_etl(rng) for _ in range(FUZZ_CASES))
+
+class TestETLParserRobust(SharedTempDirTestCase):
+    """Test class for robust ETL parser testing"""
+    
+    temp_prefix = "vyom_test_etl_"
     
     def generate_minimal_etl(self, num_trees=2, with_bom=False, corrupted=False):
         """Generate a minimal ETL file with the specified number of trees"""
-        content = []
+        if not corrupted:
+            return minimal_etl(num_trees, with_bom)
         
-        if with_bom:
-            content.append('\ufeff')  # Add BOM at start
-        
-        for i in range(num_trees):
-            # Add tree header
-            content.append(f'HTGR_PRA, TREE_{i}, IE-TREE_{i} =')
-            
-            # Add tree content sections
-            content.append('^TOPS')
-            content.append(f'TOP_EVENT_{i}_1, TOP_EVENT_{i}_2')
-            
-            content.append('^SEQUENCES')
-            content.append('*')
-            content.append(f'Y, SEQ_{i}_1, , OK')
-            content.append(f'Y, SEQ_{i}_2, , FAIL')
-            
-            content.append('^LOGIC')
-            content.append(f'SEQ_{i}_1, TOP_EVENT_{i}_1')
-            content.append(f'SEQ_{i}_2, TOP_EVENT_{i}_2')
-            
-            # Add EOS marker for all but the last tree
-            if i < num_trees - 1:
-                content.append('^EOS')
-                if with_bom:
-                    content.append('\ufeff')  # Add BOM after EOS
+        content = list(minimal_etl_lines(num_trees, with_bom))
         
-        # Introduce corruption if requested
-        if corrupted:
-            # Randomly corrupt some section
-            corrupt_index = random.randint(1, len(content) - 1)
-            if '^' in content[corrupt_index]:
-                # Corrupt a section marker
-                content[corrupt_index] = content[corrupt_index].replace('^', '&')
-            else:
-                # Corrupt a content line
-                content[corrupt_index] = '<<<CORRUPTED>>>'
+        # Randomly corrupt some section
+        corrupt_index = random.randint(1, len(content) - 1)
+        if '^' in content[corrupt_index]:
+            # Corrupt a section marker
+            content[corrupt_index] = content[corrupt_index].replace('^', '&')
+        else:
+            # Corrupt a content line
+            content[corrupt_index] = '<<<CORRUPTED>>>'
         
         return '\n'.join(content)
     
-    def create_test_etl_file(self, content, filename=".ETL"):
-        """Create a test ETL file with the given content"""
-        file_path = os.path.join(self.test_data_dir, filename)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return file_path
-    
-    def create_test_zip(self, files_dict):
-        """Create a test ZIP file with the given files"""
-        zip_path = os.path.join(self.temp_dir, "test_etl.zip")
-        
-        with zipfile.ZipFile(zip_path, 'w') as zip_file:
-            for filename, content in files_dict.items():
-                file_path = os.path.join(self.test_data_dir, filename)
-                
-                # Create the file
-                if isinstance(content, str):
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                else:
-                    with open(file_path, 'wb') as f:
-                        f.write(content)
-                
-                # Add to ZIP
-                arcname = os.path.join("_Subs", filename)
-                zip_file.write(file_path, arcname=arcname)
-        
-        return zip_path
-    
     def test_basic_etl_parsing(self):
         """Test basic ETL parsing with minimal content"""
         etl_content = self.generate_minimal_etl(num_trees=3)
@@ -159,43 +179,13 @@ class TestETLParserRobust(unittest.TestCase):
     
     def test_fuzz_etl_parser(self):
         """Fuzz test the ETL parser with randomly generated content"""
-        # Generate multiple random ETL files with various issues
-        for _ in range(5):
-            # Generate random content with some SAPHIRE-like structure
-            lines = []
-            
-            # Randomly decide if it has a BOM
-            if random.choice([True, False]):
-                lines.append('\ufeff')
-            
-            # Add some random tree structure
-            num_trees = random.randint(1, 5)
-            
-            for i in range(num_trees):
-                # Random tree name
-                tree_name = ''.join(random.choice(string.ascii_uppercase) for _ in range(8))
-                lines.append(f'HTGR_PRA, {tree_name}, IE-{tree_name} =')
-                
-                # Add random sections
-                for section in ['^TOPS', '^SEQUENCES', '^LOGIC', '^TEXT', '^NODESUBS']:
-                    if random.choice([True, False]):
-                        lines.append(section)
-                        # Add some random content for this section
-                        num_lines = random.randint(1, 5)
-                        for _ in range(num_lines):
-                            lines.append(''.join(random.choice(string.printable) for _ in range(20)))
-                
-                # Add EOS marker except for last tree
-                if i < num_trees - 1:
-                    lines.append('^EOS')
-                    # Maybe add BOM after EOS
-                    if random.choice([True, False]):
-                        lines.append('\ufeff')
-            
-            # Test parsing this random content
-            content = '\n'.join(lines)
-            result = parse_etl_file(content)
-            
+        # Generate multiple random ETL files with various issues; each one
+        # parses independently, so spread them over worker processes
+        corpus = fuzz_corpus()
+        with ProcessPoolExecutor(max_workers=min(len(corpus), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(parse_etl_file, corpus))
+        
+        for result in results:
             # Basic validation - we're mainly testing that it doesn't crash
             self.assertEqual(result['type'], 'event_tree_logic')
             self.assertIn('event_trees', result['data'])
@@ -242,28 +232,18 @@ class TestETLParserRobust(unittest.TestCase):
         # Generate ETL content
         etl_content = self.generate_minimal_etl(num_trees=3, with_bom=True)
         
-        # Parse it once
+        # Parse it twice; the parser returns plain dicts and lists, so the
+        # results can be compared directly
         first_result = parse_etl_file(etl_content)
-        
-        # Convert to JSON and back to ensure we're comparing like with like
-        first_json = json.dumps(first_result)
-        first_result = json.loads(first_json)
-        
-        # Parse it again
         second_result = parse_etl_file(etl_content)
-        second_json = json.dumps(second_result)
-        second_result = json.loads(second_json)
         
-        # Results should be identical (excluding any timing or non-deterministic values)
+        # Results should be identical
         self.assertEqual(first_result['type'], second_result['type'])
         self.assertEqual(
-            len(first_result['data']['event_trees']), 
-            len(second_result['data']['event_trees'])
+            sorted(first_result['data']['event_trees']),
+            sorted(second_result['data']['event_trees'])
         )
-        
-        # Check each tree name is present in both results
-        for tree_name in first_result['data']['event_trees']:
-            self.assertIn(tree_name, second_result['data']['event_trees'])
+        self.assertEqual(first_result, second_result)
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -7,14 +7,14 @@ and property-based testing principles.
 """
 import os
 import sys
-import tempfile
-import zipfile
 import random
 import string
 import json
+import functools
 import unittest
 import logging
 from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -22,111 +22,126 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from vyom.schema.saphire import parse_saphire_file
 from vyom.extractor import analyze_files, extract_zip, determine_file_type, SAPHIRE_EXTENSIONS
+from tests.helpers import SharedTempDirTestCase, write_test_zip
 
 # Configure logging
 logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Seed for the generated file contents, so a failing input can be reproduced
+GENERATOR_SEED = 1234
+
+rng = random.Random(GENERATOR_SEED)
+
 class FileGenerator:
-    """Generator for test SAPHIRE files"""
+    """Generator for test SAPHIRE files
+    
+    Contents are cached per set of arguments, so every extension that maps
+    to the same generator gets the same text back.
+    """
+    
+    # Extensions that share a generator
+    BE_EXTENSIONS = frozenset({'.BEI', '.BEC', '.BED', '.BEA', '.BET', '.BEF', '.BEG', '.BEH'})
+    FT_EXTENSIONS = frozenset({'.FTL', '.FTD', '.FTA', '.FTC', '.FTT', '.FTY'})
+    ET_EXTENSIONS = frozenset({'.ETL', '.ETD', '.ETA'})
+    FAD_EXTENSIONS = frozenset({'.FAD', '.PRF', '.PRF2'})
+    
+    # Row templates, filled with % formatting
+    BEI_ROW = "BE%d,%s,Basic Event %d,%s"  # ID,probability,name,type
+    FTL_GATE = "G%d %s %s"  # gate ID, gate type, inputs
+    ETL_TREE = "\n".join([
+        'HTGR_PRA, TREE_%(i)d, IE-TREE_%(i)d =',
+        '^TOPS',
+        'TOP_EVENT_%(i)d_1, TOP_EVENT_%(i)d_2',
+        '^SEQUENCES',
+        '*',
+        'Y, SEQ_%(i)d_1, , OK',
+        'Y, SEQ_%(i)d_2, , FAIL',
+        '^LOGIC',
+        'SEQ_%(i)d_1, TOP_EVENT_%(i)d_1',
+        'SEQ_%(i)d_2, TOP_EVENT_%(i)d_2',
+    ])
     
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def generate_bei_content(cls, num_events=5):
         """Generate BEI (Basic Event Information) file content"""
-        content = []
-        for i in range(num_events):
-            # Format: ID,probability,name,type
-            event_id = f"BE{i}"
-            prob = round(random.uniform(0.0, 1.0), 4)
-            name = f"Basic Event {i}"
-            event_type = random.choice(["RANDOM", "DEMAND", "CCF"])
-            content.append(f"{event_id},{prob},{name},{event_type}")
-        return "\n".join(content)
+        # Draw all the random columns up front, then format every row at once
+        probs = [round(rng.uniform(0.0, 1.0), 4) for _ in range(num_events)]
+        event_types = rng.choices(["RANDOM", "DEMAND", "CCF"], k=num_events)
+        
+        row = cls.BEI_ROW
+        return "\n".join(
+            row % (i, prob, i, event_type)
+            for i, (prob, event_type) in enumerate(zip(probs, event_types))
+        )
     
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def generate_ftl_content(cls, num_gates=3, num_events=5):
         """Generate FTL (Fault Tree Logic) file content"""
         content = ["HTGR_PRA, SAMPLE_TREE ="]
         
         # Create basic events
-        basic_events = [f"BE{i}" for i in range(num_events)]
+        basic_events = ["BE%d" % i for i in range(num_events)]
         
         # Create gates
+        gate_types = rng.choices(["AND", "OR", "NOT", "XOR"], k=num_gates)
         gates = []
-        for i in range(num_gates):
-            gate_id = f"G{i}"
-            gate_type = random.choice(["AND", "OR", "NOT", "XOR"])
-            
+        for i, gate_type in enumerate(gate_types):
             # Gate inputs can be other gates or basic events
             inputs = []
-            num_inputs = random.randint(1, 3)
+            num_inputs = rng.randint(1, 3)
             
             for _ in range(num_inputs):
-                if i > 0 and random.random() < 0.3:  # 30% chance to reference another gate
-                    inputs.append(f"G{random.randint(0, i-1)}")
+                if i > 0 and rng.random() < 0.3:  # 30% chance to reference another gate
+                    inputs.append("G%d" % rng.randint(0, i-1))
                 else:
-                    inputs.append(random.choice(basic_events))
+                    inputs.append(rng.choice(basic_events))
             
-            gates.append(f"{gate_id} {gate_type} {' '.join(inputs)}")
+            gates.append(cls.FTL_GATE % (i, gate_type, ' '.join(inputs)))
         
         content.extend(gates)
         content.append("^EOS")
         return "\n".join(content)
     
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def generate_etl_content(cls, num_trees=2, with_bom=False):
         """Generate ETL (Event Tree Logic) file content"""
-        content = []
-        
-        if with_bom:
-            content.append('\ufeff')  # Add BOM at start
-        
-        for i in range(num_trees):
-            # Add tree header
-            content.append(f'HTGR_PRA, TREE_{i}, IE-TREE_{i} =')
-            
-            # Add tree content sections
-            content.append('^TOPS')
-            content.append(f'TOP_EVENT_{i}_1, TOP_EVENT_{i}_2')
-            
-            content.append('^SEQUENCES')
-            content.append('*')
-            content.append(f'Y, SEQ_{i}_1, , OK')
-            content.append(f'Y, SEQ_{i}_2, , FAIL')
-            
-            content.append('^LOGIC')
-            content.append(f'SEQ_{i}_1, TOP_EVENT_{i}_1')
-            content.append(f'SEQ_{i}_2, TOP_EVENT_{i}_2')
-            
-            # Add EOS marker for all but the last tree
-            if i < num_trees - 1:
-                content.append('^EOS')
-                if with_bom:
-                    content.append('\ufeff')  # Add BOM after EOS
+        trees = [cls.ETL_TREE % {'i': i} for i in range(num_trees)]
         
+        # Trees are separated by EOS markers, and with_bom adds a BOM at the
+        # start and after each EOS
+        content = ['\ufeff'] if with_bom else []
+        separator = '\n^EOS\n\ufeff\n' if with_bom else '\n^EOS\n'
+        if trees:
+            content.append(separator.join(trees))
         return "\n".join(content)
     
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def generate_fad_content(cls):
         """Generate FAD (Project Description) file content"""
-        return f"Test Project {random.randint(1,100)},This is a test project description for SAPHIRE testing"
+        return f"Test Project {rng.randint(1,100)},This is a test project description for SAPHIRE testing"
     
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def generate_mard_content(cls):
         """Generate MARD file content"""
-        return f"MARD file content for test project {random.randint(1,100)}"
+        return f"MARD file content for test project {rng.randint(1,100)}"
     
     @classmethod
     def generate_content_for_type(cls, file_type, with_bom=False):
         """Generate content based on file type"""
-        if file_type in ['.BEI', '.BEC', '.BED', '.BEA', '.BET', '.BEF', '.BEG', '.BEH']:
+        if file_type in cls.BE_EXTENSIONS:
             return cls.generate_bei_content()
-        elif file_type in ['.FTL', '.FTD', '.FTA', '.FTC', '.FTT', '.FTY']:
+        elif file_type in cls.FT_EXTENSIONS:
             return cls.generate_ftl_content()
-        elif file_type in ['.ETL', '.ETD', '.ETA']:
+        elif file_type in cls.ET_EXTENSIONS:
             return cls.generate_etl_content(with_bom=with_bom)
-        elif file_type in ['.FAD', '.PRF', '.PRF2']:
+        elif file_type in cls.FAD_EXTENSIONS:
             return cls.generate_fad_content()
         elif file_type == '.MARD':
             return cls.generate_mard_content()
@@ -134,19 +149,10 @@ class FileGenerator:
             return f"Generic content for {file_type}"
 
 
-class TestGenericExtraction(unittest.TestCase):
+class TestGenericExtraction(SharedTempDirTestCase):
     """Test class for generic file extraction testing"""
     
-    def setUp(self):
-        """Set up test environment"""
-        self.temp_dir = tempfile.mkdtemp(prefix="vyom_test_generic_")
-        self.test_data_dir = os.path.join(self.temp_dir, "test_data")
-        os.makedirs(self.test_data_dir, exist_ok=True)
-    
-    def tearDown(self):
-        """Clean up after tests"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    temp_prefix = "vyom_test_generic_"
     
     def create_test_file(self, file_extension, content):
         """Create a test file with the given extension and content"""
@@ -161,80 +167,116 @@ class TestGenericExtraction(unittest.TestCase):
             f.write(content)
         return file_path
     
-    def create_test_zip(self, files_dict):
-        """Create a test ZIP file with the given files"""
-        zip_path = os.path.join(self.temp_dir, "test_saphire.zip")
-        
-        with zipfile.ZipFile(zip_path, 'w') as zip_file:
-            for filename, content in files_dict.items():
-                file_path = os.path.join(self.test_data_dir, filename)
-                
-                # Create the file
-                if isinstance(content, str):
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                else:
-                    with open(file_path, 'wb') as f:
-                        f.write(content)
-                
-                # Add to ZIP
-                arcname = os.path.join("_Subs", filename)
-                zip_file.write(file_path, arcname=arcname)
-        
-        return zip_path
-    
     def test_individual_file_parsing(self):
         """Test parsing of individual SAPHIRE files"""
-        # Test each SAPHIRE file type
+        # Test each SAPHIRE file type, skipping non-critical extensions to
+        # speed up test. Content is generated up front so the seeded draws
+        # happen in a fixed order.
+        tasks = []
         for ext, description in SAPHIRE_EXTENSIONS.items():
-            # Skip non-critical extensions to speed up test
             if ext not in ['.BEI', '.FTL', '.ETL', '.FAD', '.MARD']:
                 continue
-                
-            logger.info(f"Testing {ext} file parsing ({description})")
-            
-            # Generate content for this file type
             with_bom = ext == '.ETL'  # Only add BOM for ETL files
             content = FileGenerator.generate_content_for_type(ext, with_bom=with_bom)
+            tasks.append((ext, description, content))
+        
+        def parse_one(task):
+            ext, description, content = task
+            logger.info(f"Testing {ext} file parsing ({description})")
             
-            # Create test file
+            # Create test file; names differ by extension, so the workers
+            # never touch the same file
             file_path = self.create_test_file(ext, content)
             
             # Parse the file
-            result = parse_saphire_file(file_path, content)
-            
+            return ext, parse_saphire_file(file_path, content)
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+            results = list(executor.map(parse_one, tasks))
+        
+        for ext, result in results:
             # Basic validation
             self.assertIn('type', result)
             self.assertIn('data', result)
             
             # Type-specific validation
-            if ext in ['.BEI', '.BEC', '.BED', '.BEA', '.BET', '.BEF', '.BEG', '.BEH']:
+            if ext in FileGenerator.BE_EXTENSIONS:
                 if 'basic_events' in result.get('data', {}):
                     self.assertTrue(len(result['data']['basic_events']) > 0)
-            elif ext in ['.FTL', '.FTD', '.FTA', '.FTC', '.FTT', '.FTY']:
+            elif ext in FileGenerator.FT_EXTENSIONS:
                 if 'fault_trees' in result.get('data', {}):
                     self.assertTrue(len(result['data']['fault_trees']) > 0)
-            elif ext in ['.ETL', '.ETD', '.ETA']:
+            elif ext in FileGenerator.ET_EXTENSIONS:
                 if 'event_trees' in result.get('data', {}):
                     self.assertTrue(len(result['data']['event_trees']) > 0)
     
-    def test_zip_extraction(self):
-        """Test extraction and parsing of a ZIP with multiple SAPHIRE files"""
-        # Create files for different SAPHIRE types
-        files = {
-            ".BEI": FileGenerator.generate_bei_content(),
-            ".FTL": FileGenerator.generate_ftl_content(),
-            ".ETL": FileGenerator.generate_etl_content(with_bom=True),
-            ".FAD": FileGenerator.generate_fad_content(),
-            ".MARD": FileGenerator.generate_mard_content()
-        }
+    def test_file_type_detection(self):
+        """Test file type detection for SAPHIRE files"""
+        for ext in SAPHIRE_EXTENSIONS:
+            # SAPHIRE extensions are classified from the name alone, before
+            # any content is read, so the file doesn't need to exist
+            file_path = os.path.join(self.test_data_dir, ext)
+            
+            # Detect the file type
+            file_type = determine_file_type(file_path)
+            
+            # The file type should be one of the SAPHIRE categories
+            self.assertIn(file_type, ['fault_tree', 'event_tree', 'basic_event', 
+                                     'end_state', 'sequence', 'project', 
+                                     'master_db', 'saphire'])
+    
+    def test_mixed_encoding(self):
+        """Test handling of files with mixed encoding"""
+        # Create ETL content with BOM
+        etl_content = FileGenerator.generate_etl_content(with_bom=True)
+        
+        # Write the same content to disk with UTF-16 encoding
+        utf16_path = os.path.join(self.test_data_dir, "utf16.ETL")
+        Path(utf16_path).write_bytes(etl_content.encode('utf-16'))
         
-        # Create a test zip with these files
-        zip_path = self.create_test_zip(files)
+        # Read it back from the file and parse
+        with open(utf16_path, 'r', encoding='utf-16', errors='replace') as f:
+            content = f.read()
+        result = parse_saphire_file(utf16_path, content)
         
-        # Extract and analyze
-        extract_dir = extract_zip(zip_path)
-        result = analyze_files(extract_dir, "test_job")
+        # The parser should handle the encoding
+        self.assertEqual(result['type'], 'event_tree_logic')
+        self.assertIn('event_trees', result['data'])
+
+
+class ExtractedZipTestCase(SharedTempDirTestCase):
+    """Base class that extracts and analyzes one ZIP for all its tests"""
+    
+    temp_prefix = "vyom_test_generic_"
+    
+    # Files to put in the ZIP, keyed by name under _Subs/
+    files = {}
+    
+    @classmethod
+    def setUpClass(cls):
+        """Build, extract and analyze the ZIP once for the class"""
+        super().setUpClass()
+        zip_path = write_test_zip(os.path.join(cls.temp_dir, "test_saphire.zip"), cls.files)
+        cls._extract_dir = extract_zip(zip_path, os.path.join(cls.temp_dir, "extracted"))
+        cls._result = analyze_files(cls._extract_dir, "test_job")
+
+
+class TestZipExtraction(ExtractedZipTestCase):
+    """Extraction of a ZIP with one file of each main SAPHIRE type"""
+    
+    # Create files for different SAPHIRE types
+    files = {
+        ".BEI": FileGenerator.generate_bei_content(),
+        ".FTL": FileGenerator.generate_ftl_content(),
+        ".ETL": FileGenerator.generate_etl_content(with_bom=True),
+        ".FAD": FileGenerator.generate_fad_content(),
+        ".MARD": FileGenerator.generate_mard_content()
+    }
+    
+    def test_zip_extraction(self):
+        """Test extraction and parsing of a ZIP with multiple SAPHIRE files"""
+        result = self._result
+        files = self.files
         
         # Verify the basic structure
         self.assertIn('saphire_data', result)
@@ -251,24 +293,23 @@ class TestGenericExtraction(unittest.TestCase):
             self.assertIn('fault_trees', result['saphire_data'])
         if len(files['.BEI']) > 0:
             self.assertIn('basic_events', result['saphire_data'])
+
+
+class TestExtractionRobustness(ExtractedZipTestCase):
+    """Extraction of a ZIP mixing valid and invalid files"""
+    
+    # Test with mixed valid/invalid files
+    files = {
+        ".BEI": "Invalid content\nMissing proper format",
+        ".FTL": FileGenerator.generate_ftl_content(),
+        ".ETL": FileGenerator.generate_etl_content(with_bom=True),
+        "corrupted.txt": "This is not a SAPHIRE file",
+        "empty.dat": ""
+    }
     
     def test_robustness_with_edge_cases(self):
         """Test extraction robustness with various edge cases"""
-        # Test with mixed valid/invalid files
-        files = {
-            ".BEI": "Invalid content\nMissing proper format",
-            ".FTL": FileGenerator.generate_ftl_content(),
-            ".ETL": FileGenerator.generate_etl_content(with_bom=True),
-            "corrupted.txt": "This is not a SAPHIRE file",
-            "empty.dat": ""
-        }
-        
-        # Create a test zip with these files
-        zip_path = self.create_test_zip(files)
-        
-        # Extract and analyze
-        extract_dir = extract_zip(zip_path)
-        result = analyze_files(extract_dir, "test_job")
+        result = self._result
         
         # The analysis should complete without exceptions
         self.assertIn('metadata', result)
@@ -279,40 +320,7 @@ class TestGenericExtraction(unittest.TestCase):
         # But valid files should still be processed
         self.assertIn('event_trees', result['saphire_data'])
         self.assertIn('fault_trees', result['saphire_data'])
-    
-    def test_file_type_detection(self):
-        """Test file type detection for SAPHIRE files"""
-        for ext in SAPHIRE_EXTENSIONS:
-            # Create a test file with this extension
-            content = FileGenerator.generate_content_for_type(ext)
-            file_path = self.create_test_file(ext, content)
-            
-            # Detect the file type
-            file_type = determine_file_type(file_path)
-            
-            # The file type should be one of the SAPHIRE categories
-            self.assertIn(file_type, ['fault_tree', 'event_tree', 'basic_event', 
-                                     'end_state', 'sequence', 'project', 
-                                     'master_db', 'saphire'])
-    
-    def test_mixed_encoding(self):
-        """Test handling of files with mixed encoding"""
-        # Create ETL content with BOM
-        etl_content = FileGenerator.generate_etl_content(with_bom=True)
-        
-        # Create the same content but with UTF-16 encoding
-        utf16_path = os.path.join(self.test_data_dir, "utf16.ETL")
-        with open(utf16_path, 'w', encoding='utf-16') as f:
-            f.write(etl_content)
-        
-        # Read it back and parse
-        with open(utf16_path, 'r', encoding='utf-16', errors='replace') as f:
-            content = f.read()
-            result = parse_saphire_file(utf16_path, content)
-        
-        # The parser should handle the encoding
-        self.assertEqual(result['type'], 'event_tree_logic')
-        self.assertIn('event_trees', result['data'])
+
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -7,15 +7,25 @@ together correctly.
 '''
 import os
 import sys
-import json
 import tempfile
 import shutil
+import functools
+from pathlib import Path
+
+# The vyom-alpha package directory, which also holds the sample data files
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
 
 # Add the parent directory to the path so that we can import the vyom module
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, str(PACKAGE_ROOT))
 
 from vyom import extractor, converter
 from vyom.schema import saphire, openpra
+from vyom.jsonio import load_json, dump_json
+
+@functools.lru_cache(maxsize=1)
+def load_saphire_json(path):
+    """Load a SAPHIRE JSON file once; callers must not modify the result"""
+    return load_json(path)
 
 # Use the test file from the SAPHIRE schema tests
 def test_extract_and_convert_workflow():
@@ -23,10 +33,9 @@ def test_extract_and_convert_workflow():
     print("Testing extract and convert workflow...")
     
     # Get the test ZIP file path
-    zip_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                          'HTGR_PRA_10162024_Final.zip')
+    zip_path = PACKAGE_ROOT / 'HTGR_PRA_10162024_Final.zip'
     
-    if not os.path.exists(zip_path):
+    if not zip_path.exists():
         print(f"Test ZIP file not found at {zip_path}, skipping integration test")
         return True  # Skip test but don't fail
     
@@ -36,7 +45,7 @@ def test_extract_and_convert_workflow():
         
         # 1. Extract the ZIP file
         print("1. Extracting ZIP file...")
-        extract_dir = extractor.extract_zip(zip_path, output_dir=output_dir)
+        extract_dir = extractor.extract_zip(str(zip_path), output_dir=output_dir)
         assert os.path.exists(extract_dir), "Extraction directory should exist"
         
         # 2. Analyze the files
@@ -85,14 +94,12 @@ def test_extract_and_convert_workflow():
         
         # 9. Save to file to verify serialization
         test_output_file = os.path.join(output_dir, "test_openpra_output.json")
-        with open(test_output_file, 'w') as f:
-            json.dump(openpra_data, f, indent=2)
+        dump_json(openpra_data, test_output_file)
         
         assert os.path.exists(test_output_file), "Output file should exist"
         
         # 10. Read back the file to verify it's valid JSON
-        with open(test_output_file, 'r') as f:
-            reloaded_data = json.load(f)
+        reloaded_data = load_json(test_output_file)
         
         assert "version" in reloaded_data, "Version should be present in reloaded data"
         
@@ -118,18 +125,16 @@ def test_direct_file_conversion():
     print("Testing direct file conversion...")
     
     # Get the test SAPHIRE JSON file
-    json_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                           'htgr_saphire_data.json')
+    json_path = PACKAGE_ROOT / 'htgr_saphire_data.json'
     
-    if not os.path.exists(json_path):
+    if not json_path.exists():
         print(f"Test JSON file not found at {json_path}, skipping direct conversion test")
         return True  # Skip test but don't fail
     
     try:
         # 1. Load the SAPHIRE JSON file
         print("1. Loading SAPHIRE JSON file...")
-        with open(json_path, 'r') as f:
-            saphire_data = json.load(f)
+        saphire_data = load_saphire_json(json_path)
         
         # 2. Validate the SAPHIRE data
         is_valid, message = saphire.validate_schema(saphire_data)
@@ -3,7 +3,6 @@ Test SAPHIRE file extraction and parsing workflow
 """
 import os
 import json
-import zipfile
 import tempfile
 import shutil
 import uuid
@@ -12,73 +11,51 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from vyom import db, extractor
+from tests.helpers import write_test_zip
 
-def create_test_files():
-    """Create various test files that might be found in a SAPHIRE export"""
-    temp_dir = tempfile.mkdtemp(prefix="vyom_test_files_")
-    
-    # Create a variety of file types that might be in a SAPHIRE export
-    
-    # 1. Create a basic event file (.BEI format)
-    bei_file = os.path.join(temp_dir, "SYSTEM.BEI")
-    with open(bei_file, 'w') as f:
-        f.write("BE1,0.01,Basic Event 1,RANDOM\n")
-        f.write("BE2,0.02,Basic Event 2,RANDOM\n")
-        f.write("BE3,0.03,Basic Event 3,RANDOM\n")
-    
-    # 2. Create a fault tree file (.FTL format)
-    ftl_file = os.path.join(temp_dir, "SYSTEM.FTL")
-    with open(ftl_file, 'w') as f:
-        f.write("TOP,OR,BE1,G1\n")
-        f.write("G1,AND,BE2,BE3\n")
-    
-    # 3. Create an event tree file (.ETG format)
-    etg_file = os.path.join(temp_dir, "SYSTEM.ETG")
-    with open(etg_file, 'w') as f:
-        f.write("LOSP,Initiating Event\n")
-        f.write("RPS,Top Event 1\n")
-        f.write("AFW,Top Event 2\n")
-        f.write("SEQ1,OK,SUCCESS,SUCCESS\n")
-        f.write("SEQ2,CD,SUCCESS,FAILURE\n")
-        f.write("SEQ3,CD,FAILURE\n")
-    
-    # 4. Create a project file (.FAD format)
-    fad_file = os.path.join(temp_dir, "SYSTEM.FAD")
-    with open(fad_file, 'w') as f:
-        f.write("Test SAPHIRE Project,This is a test project for Vyom\n")
-    
-    # 5. Create a descriptive JSON file that might be included
-    json_file = os.path.join(temp_dir, "project_info.json")
+def create_test_zip():
+    """Create a test ZIP file with SAPHIRE-like files"""
+    # A variety of file types that might be found in a SAPHIRE export,
+    # kept in memory and written straight into the archive
     project_info = {
         "name": "Test SAPHIRE Project",
         "description": "Test project for SAPHIRE export",
         "created_date": "2023-01-01",
         "version": "8.2.0"
     }
-    with open(json_file, 'w') as f:
-        json.dump(project_info, f, indent=2)
-    
-    return temp_dir
-
-def create_test_zip():
-    """Create a test ZIP file with SAPHIRE-like files"""
-    # Create test files
-    files_dir = create_test_files()
+    files = {
+        # 1. A basic event file (.BEI format)
+        "SYSTEM.BEI": (
+            "BE1,0.01,Basic Event 1,RANDOM\n"
+            "BE2,0.02,Basic Event 2,RANDOM\n"
+            "BE3,0.03,Basic Event 3,RANDOM\n"
+        ),
+        # 2. A fault tree file (.FTL format)
+        "SYSTEM.FTL": (
+            "TOP,OR,BE1,G1\n"
+            "G1,AND,BE2,BE3\n"
+        ),
+        # 3. An event tree file (.ETG format)
+        "SYSTEM.ETG": (
+            "LOSP,Initiating Event\n"
+            "RPS,Top Event 1\n"
+            "AFW,Top Event 2\n"
+            "SEQ1,OK,SUCCESS,SUCCESS\n"
+            "SEQ2,CD,SUCCESS,FAILURE\n"
+            "SEQ3,CD,FAILURE\n"
+        ),
+        # 4. A project file (.FAD format)
+        "SYSTEM.FAD": "Test SAPHIRE Project,This is a test project for Vyom\n",
+        # 5. A descriptive JSON file that might be included
+        "project_info.json": json.dumps(project_info, indent=2),
+    }
     
     # Create a temporary directory for the ZIP file
     temp_dir = tempfile.mkdtemp(prefix="vyom_test_zip_")
     zip_path = os.path.join(temp_dir, "saphire_export.zip")
     
     # Create a ZIP file with all the test files
-    with zipfile.ZipFile(zip_path, 'w') as zip_file:
-        for root, _, files in os.walk(files_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, files_dir)
-                zip_file.write(file_path, arcname=arcname)
-    
-    # Clean up the test files
-    shutil.rmtree(files_dir)
+    write_test_zip(zip_path, files, prefix="")
     
     return zip_path, temp_dir
 
@@ -167,8 +144,7 @@ def test_is_saphire_file_detection():
     file_path = os.path.join(temp_dir, "saphire_project.json")
     
     try:
-        with open(file_path, 'w') as f:
-            json.dump(project_data, f)
+        Path(file_path).write_bytes(json.dumps(project_data).encode('utf-8'))
         
         # Test detection
         is_saphire = extractor.is_saphire_file(file_path, project_data)
@@ -183,16 +159,14 @@ def test_is_saphire_file_detection():
         }
         
         non_saphire_path = os.path.join(temp_dir, "not_saphire.json")
-        with open(non_saphire_path, 'w') as f:
-            json.dump(non_saphire_data, f)
+        Path(non_saphire_path).write_bytes(json.dumps(non_saphire_data).encode('utf-8'))
         
         is_saphire = extractor.is_saphire_file(non_saphire_path, non_saphire_data)
         assert not is_saphire, "Incorrectly detected non-SAPHIRE file as SAPHIRE"
         
         # Test with filename-based detection
         saphire_name_path = os.path.join(temp_dir, "saphire_model_export.json")
-        with open(saphire_name_path, 'w') as f:
-            json.dump(non_saphire_data, f)
+        Path(saphire_name_path).write_bytes(json.dumps(non_saphire_data).encode('utf-8'))
         
         is_saphire = extractor.is_saphire_file(saphire_name_path, non_saphire_data)
         assert is_saphire, "Failed to detect SAPHIRE file based on filename"
@@ -226,8 +200,7 @@ def test_file_type_detection():
         
         for filename, expected_type in file_types.items():
             file_path = os.path.join(temp_dir, filename)
-            with open(file_path, 'w') as f:
-                f.write("Test content")
+            Path(file_path).write_bytes(b"Test content")
             
             detected_type = extractor.determine_file_type(file_path)
             assert detected_type == expected_type, f"Expected {expected_type} for {filename}, got {detected_type}"
@@ -0,0 +1,90 @@
+"""
+Tests for the schema versioning script
+"""
+import os
+import copy
+import json
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+import pytest
+
+from vyom.schema import openpra
+import schema_versioning
+
+@pytest.fixture(autouse=True)
+def fresh_schema_template(monkeypatch):
+    """Give each test its own template; create_empty_schema shares its nested dicts"""
+    monkeypatch.setattr(openpra, "OPENPRA_SCHEMA", copy.deepcopy(openpra.OPENPRA_SCHEMA))
+
+def write_nested_version_doc(tmp_path, nested_version, large=False):
+    """Write a 1.0.0 document whose metadata has a "version" key ahead of the top-level one"""
+    schema = openpra.create_empty_schema("1.0.0")
+    schema["metadata"]["source"] = {"tool": "SAPHIRE", "version": nested_version}
+    if large:
+        # Push the file past the header scan so the version is peeked first
+        schema["metadata"]["description"] = "x" * schema_versioning.HEADER_SCAN_BYTES
+
+    # Put metadata first so the nested key is the first "version" in the file
+    doc = {"metadata": schema.pop("metadata")}
+    doc.update(schema)
+
+    file_path = tmp_path / "doc.json"
+    file_path.write_text(json.dumps(doc, indent=2))
+    return file_path
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+@pytest.mark.parametrize("nested_version", ["2.0.0", "8.2.0"])
+@pytest.mark.parametrize("large", [False, True])
+def test_upgrade_ignores_nested_version(tmp_path, monkeypatch, use_ijson, nested_version, large):
+    """Only the top-level "version" decides whether and how a file is upgraded"""
+    if not use_ijson:
+        monkeypatch.setattr(schema_versioning, "ijson", None)
+    file_path = write_nested_version_doc(tmp_path, nested_version, large)
+
+    assert schema_versioning.upgrade_file(str(file_path), "2.0.0")
+
+    upgraded_path = tmp_path / "doc_v2.0.0.json"
+    assert upgraded_path.exists(), "Upgraded file should be written"
+    assert json.loads(upgraded_path.read_text())["version"] == "2.0.0"
+
+def test_upgrade_does_not_peek_small_files(tmp_path, monkeypatch):
+    """A file that fits in the header scan is parsed once, without a separate peek"""
+    def fail_peek(file_path):
+        raise AssertionError("peek_version should not run for a small file")
+    monkeypatch.setattr(schema_versioning, "peek_version", fail_peek)
+    file_path = write_nested_version_doc(tmp_path, "2.0.0")
+
+    assert schema_versioning.upgrade_file(str(file_path), "2.0.0")
+
+def test_upgrade_skips_full_load_of_large_current_file(tmp_path, monkeypatch, capsys):
+    """A large file already at the target version is answered from the peek alone"""
+    def fail_load(file_path):
+        raise AssertionError("load_json should not run for a file at the target version")
+    monkeypatch.setattr(schema_versioning, "load_json", fail_load)
+    schema = openpra.create_empty_schema("2.0.0")
+    schema["metadata"]["description"] = "x" * schema_versioning.HEADER_SCAN_BYTES
+    file_path = tmp_path / "doc.json"
+    file_path.write_text(json.dumps(schema))
+
+    assert schema_versioning.upgrade_file(str(file_path), "2.0.0")
+    assert "already at version 2.0.0" in capsys.readouterr().out
+
+def test_upgrade_rejects_file_without_version(tmp_path, capsys):
+    """A small file with no version anywhere is rejected before parsing"""
+    file_path = tmp_path / "doc.json"
+    file_path.write_text(json.dumps({"metadata": {}, "models": {}}))
+
+    assert not schema_versioning.upgrade_file(str(file_path), "2.0.0")
+    assert "No version information" in capsys.readouterr().out
+
+def test_upgrade_reports_non_string_version(tmp_path, capsys):
+    """A version that isn't a string is reported as such, not as missing"""
+    file_path = tmp_path / "doc.json"
+    file_path.write_text(json.dumps({"version": 2, "metadata": {}, "models": {}}))
+
+    assert not schema_versioning.upgrade_file(str(file_path), "2.0.0")
+    out = capsys.readouterr().out
+    assert "No version information" not in out
+    assert "Unknown source version: 2" in out
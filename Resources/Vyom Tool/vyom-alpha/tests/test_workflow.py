@@ -1,6 +1,5 @@
 import os
 import json
-import zipfile
 import tempfile
 import shutil
 import uuid
@@ -13,6 +12,7 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from vyom import db, extractor, converter
+from tests.helpers import write_test_zip
 
 
 def create_sample_saphire_data():
@@ -94,20 +94,11 @@ def create_test_zip():
     temp_dir = tempfile.mkdtemp(prefix="vyom_test_")
     zip_path = os.path.join(temp_dir, "test_saphire.zip")
     
-    # Create a directory to hold the test files
-    test_files_dir = os.path.join(temp_dir, "test_files")
-    os.makedirs(test_files_dir, exist_ok=True)
-    
     # Create a sample SAPHIRE file
     saphire_data = create_sample_saphire_data()
-    saphire_file_path = os.path.join(test_files_dir, "saphire_model.json")
-    
-    with open(saphire_file_path, 'w') as f:
-        json.dump(saphire_data, f, indent=2)
     
-    # Create a ZIP file with the SAPHIRE file
-    with zipfile.ZipFile(zip_path, 'w') as zip_file:
-        zip_file.write(saphire_file_path, arcname="saphire_model.json")
+    # Create a ZIP file with the SAPHIRE file, written straight from memory
+    write_test_zip(zip_path, {"saphire_model.json": json.dumps(saphire_data, indent=2)}, prefix="")
     
     return zip_path, temp_dir
 
@@ -7,10 +7,6 @@ import datetime
 import pkg_resources
 from pathlib import Path
 from . import db
-from . import extractor
-from . import converter
-from . import viewer
-from . import session
 from .schema import openpra
 from typing import Optional
 
@@ -175,6 +171,9 @@ def import_(zip_file, output):
       vyom import path/to/saphire.zip
       vyom import path/to/saphire.zip --output path/to/extract
     """
+    # Imported here so `vyom --help` and unrelated commands don't pay for the parser
+    from . import extractor
+    
     job_id = str(int(time.time()))
     click.echo(f"Starting import job {job_id}...")
     
@@ -469,6 +468,8 @@ def convert(job_id, output, pretty, format):
       vyom convert last --output openpra_result.json
       vyom convert - --compact  # Save as compact JSON
     """
+    from . import converter
+    
     try:
         job_id = resolve_job_id(job_id)
         job_data = db.get_job_data(job_id)
@@ -535,6 +536,8 @@ def convert_file(input_file, output, pretty, format):
       vyom convert-file saphire_data.json
       vyom convert-file saphire_data.json --output openpra_result.json
     """
+    from . import converter
+    
     try:
         # Load the SAPHIRE file
         click.echo(f"Loading SAPHIRE data from {input_file}...")
@@ -628,6 +631,10 @@ def view(job_id, no_browser, use_llm, prompt, data_file, output_dir, web, port,
     If JOB_ID is provided, visualizes data from that job.
     Otherwise, can generate visualizations from prompts or data files.
     """
+    # The viewer pulls in the LLM client stack, so only load it for this command
+    from . import viewer
+    from . import session
+    
     # Set verbose mode in environment if specified
     if verbose:
         os.environ["VERBOSE_LLM"] = "1"
@@ -1,4 +1,3 @@
-import duckdb
 import os
 import json
 import uuid
@@ -12,6 +11,10 @@ DB_PATH = os.path.expanduser("~/.vyom/vyom.duckdb")
 
 def get_connection():
     """Establish connection to DuckDB and create schema if needed"""
+    # duckdb is slow to import, so load it on first connection rather than
+    # whenever the CLI starts
+    import duckdb
+    
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     conn = duckdb.connect(DB_PATH)
     
@@ -123,22 +126,11 @@ def save_job_data(job_id, data):
     conn = get_connection()
     data_json = json.dumps(data)
     
-    # Check if record exists
-    existing = conn.execute("""
-        SELECT 1 FROM job_data WHERE job_id = ?
-    """, (job_id,)).fetchone()
-    
-    if existing:
-        conn.execute("""
-            UPDATE job_data
-            SET data = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE job_id = ?
-        """, (data_json, job_id))
-    else:
-        conn.execute("""
-            INSERT INTO job_data (job_id, data)
-            VALUES (?, ?)
-        """, (job_id, data_json))
+    # Single upsert instead of a lookup followed by UPDATE or INSERT
+    conn.execute("""
+        INSERT OR REPLACE INTO job_data (job_id, data, updated_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+    """, (job_id, data_json))
 
 def get_job_data(job_id):
     conn = get_connection()
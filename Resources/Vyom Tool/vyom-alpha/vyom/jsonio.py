@@ -0,0 +1,25 @@
+"""
+JSON file reading and writing, using orjson when it is installed.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional (the "speedups" extra); fall back to the stdlib json module
+    orjson = None
+
+def load_json(file_path):
+    """Load a JSON file, using orjson when available"""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def dump_json(data, file_path):
+    """Write data as indented JSON in a single write, using orjson when available"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        # json.dump would issue one small write per token; encode up front instead
+        payload = json.dumps(data, indent=2).encode('utf-8')
+    with open(file_path, 'wb') as f:
+        f.write(payload)
@@ -5,7 +5,7 @@ import os
 import json
 import logging
 import datetime
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, Optional, Callable
 
 # Configure logging
 logging.basicConfig(level=logging.INFO,
@@ -31,6 +31,12 @@ SCHEMA_VERSIONS = {
     }
 }
 
+# Set of known versions for membership checks
+SUPPORTED_VERSIONS = frozenset(SCHEMA_VERSIONS)
+
+# Known versions in release order, built once at import
+_VERSION_ORDER = tuple(SCHEMA_VERSIONS)
+
 # Current OpenPRA schema version
 SCHEMA_VERSION = "2.0.0"
 
@@ -67,7 +73,8 @@ OPENPRA_SCHEMA = {
 
 def get_schema_versions() -> List[str]:
     """Get a list of all available schema versions"""
-    return list(SCHEMA_VERSIONS.keys())
+    # A fresh list each call, so callers may modify it
+    return list(_VERSION_ORDER)
 
 def get_latest_schema_version() -> str:
     """Get the latest schema version"""
@@ -132,12 +139,10 @@ def validate_schema(data: Dict[str, Any]) -> Tuple[bool, str]:
         return False, f"Unsupported schema version: {schema_version}. Supported versions: {', '.join(SCHEMA_VERSIONS.keys())}"
     
     # Validation logic based on schema version
-    if schema_version == "1.0.0" or schema_version == "1.1.0":
-        return validate_schema_v1(data)
-    elif schema_version == "2.0.0":
-        return validate_schema_v2(data)
-    else:
+    validator = get_schema_validator(schema_version)
+    if validator is None:
         return False, f"No validation logic for schema version {schema_version}"
+    return validator(data)
 
 def validate_schema_v1(data: Dict[str, Any]) -> Tuple[bool, str]:
     """Validate against version 1.x schema"""
@@ -220,6 +225,17 @@ def validate_models(models: Dict[str, Any]) -> Tuple[bool, str]:
     
     return True, "Valid"
 
+# Validator for each schema version, resolved once instead of per call
+SCHEMA_VALIDATORS = {
+    "1.0.0": validate_schema_v1,
+    "1.1.0": validate_schema_v1,
+    "2.0.0": validate_schema_v2
+}
+
+def get_schema_validator(version: str) -> Optional[Callable[[Dict[str, Any]], Tuple[bool, str]]]:
+    """Get the validation function for a schema version, or None if there is none"""
+    return SCHEMA_VALIDATORS.get(version)
+
 def upgrade_schema(data: Dict[str, Any], target_version: str = SCHEMA_VERSION) -> Tuple[Dict[str, Any], bool, str]:
     """
     Upgrade a schema from an older version to a newer version.
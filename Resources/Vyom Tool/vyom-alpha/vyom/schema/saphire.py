@@ -3,6 +3,7 @@ SAPHIRE schema definitions for parsing and validating SAPHIRE data.
 """
 import os
 import re
+import sys
 import json
 import jsonschema
 import logging
@@ -215,7 +216,7 @@ def parse_bei_file(content):
             parts = line.split(',')
             if len(parts) >= 2:
                 event = {
-                    "id": parts[0].strip(),
+                    "id": sys.intern(parts[0].strip()),
                     "probability": float(parts[1].strip()) if parts[1].strip() else 0.0
                 }
                 if len(parts) > 2:
@@ -278,9 +279,11 @@ def parse_ftl_file(content):
                     # Split the line into parts
                     parts = line.split()
                     if len(parts) >= 2:  # Changed from 3 to 2 to handle TRAN gates
-                        gate_id = parts[0]
+                        # IDs repeat across gates, trees and the basic event
+                        # list, so intern them to share one string per ID
+                        gate_id = sys.intern(parts[0])
                         gate_type = parts[1]
-                        inputs = parts[2:] if len(parts) > 2 else []
+                        inputs = [sys.intern(part) for part in parts[2:]]
                         
                         # Create the gate
                         gate = {
@@ -324,191 +327,60 @@ def parse_ftl_file(content):
 
 def parse_etl_file(content):
     """Parse an ETL (Event Tree Logic) file"""
+    return parse_etl_stream([content])
+
+# str.translate table that deletes byte order marks (U+FEFF)
+BOM_TRANSLATION = {0xFEFF: None}
+
+def iter_etl_blocks(chunks):
+    """
+    Split ETL text supplied in chunks into its ^EOS-separated tree blocks.
+    
+    Blocks are yielded as soon as their ^EOS marker has been read, so only the
+    current block is held in memory. Byte order marks are removed wherever
+    they occur; otherwise the blocks match content.split('^EOS').
+    
+    Args:
+        chunks: Iterable of text chunks, e.g. iter(lambda: f.read(65536), '')
+    """
+    buffer = ""
+    for chunk in chunks:
+        # Drop every BOM in one pass; exports often repeat them after ^EOS
+        chunk = chunk.translate(BOM_TRANSLATION)
+        
+        # A marker may straddle two chunks, so back up over a partial one
+        search_from = max(len(buffer) - len('^EOS') + 1, 0)
+        buffer += chunk
+        start = 0
+        end = buffer.find('^EOS', search_from)
+        while end != -1:
+            yield buffer[start:end]
+            start = end + len('^EOS')
+            end = buffer.find('^EOS', start)
+        if start:
+            buffer = buffer[start:]
+    yield buffer
+
+def parse_etl_stream(chunks):
+    """
+    Parse an ETL (Event Tree Logic) file supplied as an iterable of text chunks.
+    
+    Gives the same result as parse_etl_file on the joined text, without ever
+    holding the whole file in memory.
+    """
     trees = {}  # Dictionary to store multiple event trees
+    sequence_index = {}  # Tree name -> {sequence id: sequence} for LOGIC lookups
     errors = []
     current_tree = None
     
     try:
         logger.info("Starting ETL file parsing")
         
-        # Remove BOM if present at the start of the file
-        if content.startswith('\ufeff'):
-            logger.debug("Removing BOM character from start of file")
-            content = content[1:]
-        
-        # Split content by ^EOS and process each tree block
-        tree_blocks = content.split('^EOS')
-        logger.info(f"Found {len(tree_blocks)} blocks after splitting by ^EOS")
-        
-        for block_idx, block in enumerate(tree_blocks):
-            if not block.strip():
-                logger.debug(f"Skipping empty block {block_idx}")
-                continue
-                
-            # Remove BOM if present at the start of the block
-            if block.strip().startswith('\ufeff'):
-                logger.debug(f"Removing BOM character from start of block {block_idx}")
-                block = block.strip()[1:]
-            
-            lines = block.strip().split('\n')
-            i = 0
-            
-            # Process the tree header - should be in the first line
-            first_line = lines[0].strip() if lines else ""
-            logger.debug(f"Block {block_idx} first line: {first_line[:50]}...")
-            
-            if first_line.startswith('HTGR_PRA,'):
-                try:
-                    # Extract the tree name
-                    # The format is: HTGR_PRA, TREE_NAME, IE-TREE_NAME =
-                    parts = first_line.split('=')[0].strip()
-                    if ',' in parts:
-                        tree_name = parts.split(',')[1].strip()
-                        current_tree = tree_name
-                        logger.info(f"Found event tree: {current_tree}")
-                        # Initialize the tree
-                        if current_tree not in trees:
-                            trees[current_tree] = {
-                                "top_events": [],
-                                "sequences": [],
-                                "node_descriptions": {},
-                                "node_substitutions": {}
-                            }
-                except Exception as e:
-                    logger.error(f"Error parsing event tree header in block {block_idx}: {str(e)}")
-                    errors.append(f"Error parsing event tree header: {str(e)}")
-                    continue
-            else:
-                # If not a valid tree block, skip it
-                logger.debug(f"Block {block_idx} does not start with HTGR_PRA, - skipping")
-                continue
-            
-            # Process the remaining lines in the block
-            i = 1  # Start from the second line
-            while i < len(lines):
-                line = lines[i].strip()
-                
-                # Skip empty lines
-                if not line:
-                    i += 1
-                    continue
-                
-                try:
-                    # Check for top events section
-                    if line == '^TOPS':
-                        i += 1  # Move to the next line
-                        if i < len(lines):
-                            tops = lines[i].strip().split(',')
-                            for top in tops:
-                                top = top.strip()
-                                if top:  # Only add non-empty top events
-                                    trees[current_tree]["top_events"].append({
-                                        "id": top,
-                                        "description": top
-                                    })
-                            logger.debug(f"Added {len(tops)} top events to {current_tree}")
-                    
-                    # Check for sequences section
-                    elif line.startswith('^SEQUENCES'):
-                        logger.debug(f"Processing SEQUENCES section for {current_tree}")
-                        i += 2  # Skip the header line
-                        seq_count = 0
-                        while i < len(lines):
-                            if i >= len(lines) or lines[i].strip().startswith('^'):
-                                break
-                                
-                            line_content = lines[i].strip()
-                            parts = line_content.split(',')
-                            if len(parts) >= 4 and parts[0].strip() == 'Y':
-                                seq_name = parts[1].strip()
-                                end_state = parts[3].strip()
-                                if seq_name:  # Only add sequences with names
-                                    seq = {
-                                        "id": seq_name,
-                                        "end_state": end_state,
-                                        "path": []  # Path will be populated from LOGIC section
-                                    }
-                                    trees[current_tree]["sequences"].append(seq)
-                                    logger.debug(f"Added sequence {seq_name} with end state {end_state}")
-                                    seq_count += 1
-                            i += 1
-                        logger.debug(f"Added {seq_count} sequences to {current_tree}")
-                        continue  # Skip the increment at the end since we're already at the next section
-                    
-                    # Check for LOGIC section
-                    elif line == '^LOGIC':
-                        logger.debug(f"Processing LOGIC section for {current_tree}")
-                        i += 1  # Move to the next line
-                        logic_count = 0
-                        while i < len(lines):
-                            if i >= len(lines) or lines[i].strip().startswith('^'):
-                                break
-                                
-                            line_content = lines[i].strip()
-                            parts = line_content.split(',')
-                            if len(parts) >= 2:
-                                seq_name = parts[0].strip()
-                                node_id = parts[1].strip()
-                                # Find the sequence and add the node to its path
-                                for seq in trees[current_tree]["sequences"]:
-                                    if seq["id"] == seq_name:
-                                        seq["path"].append(node_id)
-                                        logic_count += 1
-                                        break
-                            i += 1
-                        logger.debug(f"Added {logic_count} logic nodes for {current_tree}")
-                        continue  # Skip the increment at the end
-                    
-                    # Check for NODESUBS section
-                    elif line == '^NODESUBS':
-                        logger.debug(f"Processing NODESUBS section for {current_tree}")
-                        i += 1  # Move to the next line
-                        subs_count = 0
-                        while i < len(lines):
-                            if i >= len(lines) or lines[i].strip().startswith('^'):
-                                break
-                                
-                            line_content = lines[i].strip()
-                            if line_content.startswith('NODEPOS'):
-                                node_pos = line_content.split()[1].strip()
-                                i += 1
-                                if i < len(lines):
-                                    subs = lines[i].strip().split('=')
-                                    if len(subs) == 2:
-                                        trees[current_tree]["node_substitutions"][node_pos] = {
-                                            "original": subs[0].strip(),
-                                            "substitute": subs[1].strip()
-                                        }
-                                        subs_count += 1
-                            i += 1
-                        logger.debug(f"Added {subs_count} node substitutions for {current_tree}")
-                        continue  # Skip the increment at the end
-                    
-                    # Check for TEXT section
-                    elif line == '^TEXT':
-                        logger.debug(f"Processing TEXT section for {current_tree}")
-                        i += 1  # Move to the next line
-                        text_count = 0
-                        while i < len(lines):
-                            if i >= len(lines) or lines[i].strip().startswith('^'):
-                                break
-                                
-                            line_content = lines[i].strip()
-                            if line_content.startswith('NODEPOS'):
-                                node_pos = line_content.split()[1].strip()
-                                i += 1
-                                if i < len(lines):
-                                    desc = lines[i].strip().strip('"')
-                                    trees[current_tree]["node_descriptions"][node_pos] = desc
-                                    text_count += 1
-                            i += 1
-                        logger.debug(f"Added {text_count} node descriptions for {current_tree}")
-                        continue  # Skip the increment at the end
-                except Exception as e:
-                    logger.error(f"Error parsing event tree content in block for {current_tree}: {str(e)}")
-                    errors.append(f"Error parsing event tree content in block for {current_tree}: {str(e)}")
-                
-                i += 1
+        block_count = 0
+        for block_idx, block in enumerate(iter_etl_blocks(chunks)):
+            block_count += 1
+            current_tree = _parse_etl_block(block, block_idx, current_tree, trees, sequence_index, errors)
+        logger.info(f"Found {block_count} blocks after splitting by ^EOS")
         
         # Log the trees found
         tree_names = list(trees.keys())
@@ -522,8 +394,8 @@ def parse_etl_file(content):
                     end_states.add(seq["end_state"])
         logger.info(f"Found {len(end_states)} unique end states in ETL file: {', '.join(end_states)}")
         
-        if len(tree_names) < len(tree_blocks) - 1:  # -1 because splitting by ^EOS may leave an empty element
-            warning_msg = f"Warning: Expected to find {len(tree_blocks)-1} trees, but found {len(tree_names)}: {', '.join(tree_names)}"
+        if len(tree_names) < block_count - 1:  # -1 because splitting by ^EOS may leave an empty element
+            warning_msg = f"Warning: Expected to find {block_count-1} trees, but found {len(tree_names)}: {', '.join(tree_names)}"
             logger.warning(warning_msg)
             errors.append(warning_msg)
         
@@ -546,6 +418,184 @@ def parse_etl_file(content):
             "errors": [error_msg]
         }
 
+def _parse_etl_block(block, block_idx, current_tree, trees, sequence_index, errors):
+    """
+    Parse one ^EOS-separated ETL block into trees.
+    
+    A block whose header has no tree name continues the previous tree, so the
+    current tree name is threaded through and returned.
+    """
+    block = block.strip()
+    if not block:
+        logger.debug(f"Skipping empty block {block_idx}")
+        return current_tree
+        
+    # Strip every line once up front; the section loops below only
+    # ever look at stripped lines
+    lines = [line.strip() for line in block.split('\n')]
+    i = 0
+    
+    # Process the tree header - should be in the first line
+    first_line = lines[0] if lines else ""
+    logger.debug(f"Block {block_idx} first line: {first_line[:50]}...")
+    
+    if first_line.startswith('HTGR_PRA,'):
+        try:
+            # Extract the tree name
+            # The format is: HTGR_PRA, TREE_NAME, IE-TREE_NAME =
+            parts = first_line.split('=')[0].strip()
+            if ',' in parts:
+                tree_name = parts.split(',')[1].strip()
+                current_tree = tree_name
+                logger.info(f"Found event tree: {current_tree}")
+                # Initialize the tree
+                if current_tree not in trees:
+                    trees[current_tree] = {
+                        "top_events": [],
+                        "sequences": [],
+                        "node_descriptions": {},
+                        "node_substitutions": {}
+                    }
+                    sequence_index[current_tree] = {}
+        except Exception as e:
+            logger.error(f"Error parsing event tree header in block {block_idx}: {str(e)}")
+            errors.append(f"Error parsing event tree header: {str(e)}")
+            return current_tree
+    else:
+        # If not a valid tree block, skip it
+        logger.debug(f"Block {block_idx} does not start with HTGR_PRA, - skipping")
+        return current_tree
+    
+    # Process the remaining lines in the block
+    i = 1  # Start from the second line
+    while i < len(lines):
+        line = lines[i]
+        
+        # Skip empty lines
+        if not line:
+            i += 1
+            continue
+        
+        try:
+            # Check for top events section
+            if line == '^TOPS':
+                i += 1  # Move to the next line
+                if i < len(lines):
+                    tops = lines[i].split(',')
+                    for top in tops:
+                        top = top.strip()
+                        if top:  # Only add non-empty top events
+                            trees[current_tree]["top_events"].append({
+                                "id": top,
+                                "description": top
+                            })
+                    logger.debug(f"Added {len(tops)} top events to {current_tree}")
+            
+            # Check for sequences section
+            elif line.startswith('^SEQUENCES'):
+                logger.debug(f"Processing SEQUENCES section for {current_tree}")
+                i += 2  # Skip the header line
+                seq_count = 0
+                while i < len(lines):
+                    if i >= len(lines) or lines[i].startswith('^'):
+                        break
+                        
+                    line_content = lines[i]
+                    parts = line_content.split(',')
+                    if len(parts) >= 4 and parts[0].strip() == 'Y':
+                        seq_name = parts[1].strip()
+                        end_state = parts[3].strip()
+                        if seq_name:  # Only add sequences with names
+                            seq = {
+                                "id": seq_name,
+                                "end_state": end_state,
+                                "path": []  # Path will be populated from LOGIC section
+                            }
+                            trees[current_tree]["sequences"].append(seq)
+                            # LOGIC rows attach to the first sequence with a given id
+                            sequence_index[current_tree].setdefault(seq_name, seq)
+                            logger.debug(f"Added sequence {seq_name} with end state {end_state}")
+                            seq_count += 1
+                    i += 1
+                logger.debug(f"Added {seq_count} sequences to {current_tree}")
+                continue  # Skip the increment at the end since we're already at the next section
+            
+            # Check for LOGIC section
+            elif line == '^LOGIC':
+                logger.debug(f"Processing LOGIC section for {current_tree}")
+                i += 1  # Move to the next line
+                logic_count = 0
+                while i < len(lines):
+                    if i >= len(lines) or lines[i].startswith('^'):
+                        break
+                        
+                    line_content = lines[i]
+                    parts = line_content.split(',')
+                    if len(parts) >= 2:
+                        seq_name = parts[0].strip()
+                        node_id = parts[1].strip()
+                        # Find the sequence and add the node to its path
+                        seq = sequence_index[current_tree].get(seq_name)
+                        if seq is not None:
+                            seq["path"].append(node_id)
+                            logic_count += 1
+                    i += 1
+                logger.debug(f"Added {logic_count} logic nodes for {current_tree}")
+                continue  # Skip the increment at the end
+            
+            # Check for NODESUBS section
+            elif line == '^NODESUBS':
+                logger.debug(f"Processing NODESUBS section for {current_tree}")
+                i += 1  # Move to the next line
+                subs_count = 0
+                while i < len(lines):
+                    if i >= len(lines) or lines[i].startswith('^'):
+                        break
+                        
+                    line_content = lines[i]
+                    if line_content.startswith('NODEPOS'):
+                        node_pos = line_content.split()[1].strip()
+                        i += 1
+                        if i < len(lines):
+                            subs = lines[i].split('=')
+                            if len(subs) == 2:
+                                trees[current_tree]["node_substitutions"][node_pos] = {
+                                    "original": subs[0].strip(),
+                                    "substitute": subs[1].strip()
+                                }
+                                subs_count += 1
+                    i += 1
+                logger.debug(f"Added {subs_count} node substitutions for {current_tree}")
+                continue  # Skip the increment at the end
+            
+            # Check for TEXT section
+            elif line == '^TEXT':
+                logger.debug(f"Processing TEXT section for {current_tree}")
+                i += 1  # Move to the next line
+                text_count = 0
+                while i < len(lines):
+                    if i >= len(lines) or lines[i].startswith('^'):
+                        break
+                        
+                    line_content = lines[i]
+                    if line_content.startswith('NODEPOS'):
+                        node_pos = line_content.split()[1].strip()
+                        i += 1
+                        if i < len(lines):
+                            desc = lines[i].strip('"')
+                            trees[current_tree]["node_descriptions"][node_pos] = desc
+                            text_count += 1
+                    i += 1
+                logger.debug(f"Added {text_count} node descriptions for {current_tree}")
+                continue  # Skip the increment at the end
+        except Exception as e:
+            logger.error(f"Error parsing event tree content in block for {current_tree}: {str(e)}")
+            errors.append(f"Error parsing event tree content in block for {current_tree}: {str(e)}")
+        
+        i += 1
+    
+    return current_tree
+
 def parse_fad_file(content):
     """Parse a FAD (Project Description) file"""
     project = {"name": "", "description": ""}
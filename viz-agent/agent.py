@@ -1,34 +1,83 @@
+import asyncio
+import hashlib
 import os
-from google import genai
-from google.genai import types
+import functools
 import json
 
-def generate():
-    client = genai.Client(
-        api_key=os.environ.get("GEMINI_API_KEY"),
-    )
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib
+    orjson = None
 
-    user_prompt = "Mermaid code for this json file\n" + \
-                  "```" + \
-                  json.dumps(json.load(open("../Resources/SAPHIRE/event_trees.json"))) + \
-                  "```"
-    model = "gemini-2.0-pro-exp-02-05"
-    contents = [
-        types.Content(
-            role="user",
-            parts=[
-                types.Part.from_text(text=user_prompt),
-            ],
-        ),
-    ]
-    generate_content_config = types.GenerateContentConfig(
-        temperature=1,
-        top_p=0.95,
-        top_k=64,
-        max_output_tokens=8192,
-        response_mime_type="text/plain",
-        system_instruction=[
-            types.Part.from_text(text="""You are a code generator that translates JSON data representing event trees into Mermaid flowchart code. Your goal is to create a visually accurate and syntactically correct Mermaid diagram that represents the event tree structure and information contained in the JSON.
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+EVENT_TREES_PATH = "../Resources/SAPHIRE/event_trees.json"
+
+# Generated Mermaid code is kept here, keyed by model, prompt and input file contents
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nucleargen", "viz")
+
+# Most cached responses kept; the least recently used are removed past this
+CACHE_MAX_ENTRIES = 64
+
+def _write_atomic(target, data):
+    """Write bytes to a cache file via a temp file; cache writes are best effort."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_file = target + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, target)
+    except OSError:
+        pass
+
+@functools.lru_cache(maxsize=8)
+def _file_digest_cached(path, mtime_ns):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def file_digest(path):
+    """SHA-256 of the raw file bytes, computed without parsing the JSON."""
+    return _file_digest_cached(path, os.stat(path).st_mtime_ns)
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path, mtime_ns):
+    with open(path, "rb") as f:
+        return _loads(f.read())
+
+def load_json(path):
+    """Parse a JSON file once and reuse the result until the file changes on disk."""
+    return _load_json_cached(path, os.stat(path).st_mtime_ns)
+
+
+# Only these saphire_data sections are used to draw event trees; the system
+# prompt marks the rest (basic_events, sequences, project, ...) as not needed
+PROMPT_SECTIONS = ("event_trees", "end_states")
+
+def _prompt_subset(data):
+    saphire_data = data.get("saphire_data", data)
+    return {"saphire_data": {key: saphire_data[key] for key in PROMPT_SECTIONS if key in saphire_data}}
+
+PROMPT_HEAD = "Mermaid code for this json file\n```"
+PROMPT_TAIL = "```"
+
+@functools.lru_cache(maxsize=8)
+def _user_prompt_cached(path, mtime_ns):
+    subset = _prompt_subset(_load_json_cached(path, mtime_ns))
+    return PROMPT_HEAD + _dumps(subset) + PROMPT_TAIL
+
+def build_user_prompt(path):
+    """Build the prompt for a JSON file, serializing it once per file version."""
+    return _user_prompt_cached(path, os.stat(path).st_mtime_ns)
+
+MODEL = "gemini-2.0-pro-exp-02-05"
+
+SYSTEM_INSTRUCTION = """You are a code generator that translates JSON data representing event trees into Mermaid flowchart code. Your goal is to create a visually accurate and syntactically correct Mermaid diagram that represents the event tree structure and information contained in the JSON.
 
 **Input:**
 
@@ -157,16 +206,161 @@ graph TD
 *   **Error Handling:**  While you don't need to implement explicit error handling for invalid JSON, your code should be robust enough to handle variations in the input (e.g., missing `node_descriptions`, different numbers of `top_events`, etc.) without crashing.  If you encounter something unexpected, make a reasonable assumption and continue.
 *   **Readability:** Generate clean, well-formatted Mermaid code that is easy to read and understand.  Use consistent indentation and spacing.
 *   **Completeness:** Generate the *complete* Mermaid code for all event trees present in the JSON, each within its own subgraph.
-*   **Inference:** You will need to *infer* the branching logic (the \"path\" of each sequence) by carefully examining the `node_substitutions` and the order of events. This is the core challenge. There is no direct \"path\" array in the input."""),
+*   **Inference:** You will need to *infer* the branching logic (the \"path\" of each sequence) by carefully examining the `node_substitutions` and the order of events. This is the core challenge. There is no direct \"path\" array in the input."""
+
+def build_contents(path=EVENT_TREES_PATH):
+    from google.genai import types
+
+    return [
+        types.Content(
+            role="user",
+            parts=[
+                types.Part.from_text(text=build_user_prompt(path)),
+            ],
+        ),
+    ]
+
+GENERATION_SETTINGS = {
+    "temperature": 1,
+    "top_p": 0.95,
+    "top_k": 64,
+    "max_output_tokens": 8192,
+    "response_mime_type": "text/plain",
+}
+
+@functools.lru_cache(maxsize=None)
+def build_generate_content_config():
+    """Build the generation config once; it does not depend on the input file."""
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        **GENERATION_SETTINGS,
+        system_instruction=[
+            types.Part.from_text(text=SYSTEM_INSTRUCTION),
         ],
     )
 
+@functools.lru_cache(maxsize=None)
+def _request_digest():
+    """Digest of everything besides the input file that shapes a response."""
+    parts = (
+        MODEL,
+        SYSTEM_INSTRUCTION,
+        json.dumps(GENERATION_SETTINGS, sort_keys=True),
+        ",".join(PROMPT_SECTIONS),
+        PROMPT_HEAD,
+        PROMPT_TAIL,
+    )
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+def _cache_file(path):
+    # Keyed on the raw file so a cache hit never has to parse the JSON
+    key_source = "\0".join((_request_digest(), file_digest(path)))
+    key = hashlib.blake2b(key_source.encode(), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, key + ".mmd")
+
+def _prune_cache():
+    """Keep the CACHE_MAX_ENTRIES most recently used responses; best effort."""
+    try:
+        entries = [entry for entry in os.scandir(CACHE_DIR) if entry.is_file()]
+    except OSError:
+        return
+    responses = []
+    for entry in entries:
+        try:
+            if entry.name.endswith(".mmd"):
+                responses.append((entry.stat().st_mtime_ns, entry.path))
+            elif entry.name.endswith(".pickle"):
+                # Left behind by older versions that cached parsed input here
+                os.remove(entry.path)
+        except OSError:
+            pass
+    responses.sort(reverse=True)
+    for _, stale in responses[CACHE_MAX_ENTRIES:]:
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+
+def read_cached_response(path):
+    """Return previously generated Mermaid code for this file version, if any."""
+    cache_file = _cache_file(path)
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    try:
+        # Mark the entry as recently used so pruning keeps it
+        os.utime(cache_file)
+    except OSError:
+        pass
+    return text
+
+def write_cached_response(path, text):
+    if not text:
+        return
+    _write_atomic(_cache_file(path), text.encode("utf-8"))
+    _prune_cache()
+
+@functools.lru_cache(maxsize=None)
+def _get_client():
+    """Create the Gemini client on first use and share it for the rest of the process."""
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY is not set")
+
+    # Imported here so cached runs and importers of this module don't pay
+    # for loading the google-genai stack
+    from google import genai
+
+    return genai.Client(
+        api_key=api_key,
+    )
+
+def stream_mermaid(path=EVENT_TREES_PATH):
+    """Yield Mermaid code for a JSON file chunk by chunk as Gemini produces it."""
+    cached = read_cached_response(path)
+    if cached is not None:
+        yield cached
+        return
+
+    client = _get_client()
+
+    parts = []
     for chunk in client.models.generate_content_stream(
-        model=model,
-        contents=contents,
-        config=generate_content_config,
+        model=MODEL,
+        contents=build_contents(path),
+        config=build_generate_content_config(),
     ):
-        print(chunk.text, end="")
+        text = chunk.text or ""
+        parts.append(text)
+        yield text
+    write_cached_response(path, "".join(parts))
+
+def generate(path=EVENT_TREES_PATH):
+    for text in stream_mermaid(path):
+        print(text, end="", flush=True)
+
+async def agenerate(path=EVENT_TREES_PATH):
+    """Async variant of generate() that returns the Mermaid code instead of printing it."""
+    cached = read_cached_response(path)
+    if cached is not None:
+        return cached
+
+    client = _get_client()
+    response = await client.aio.models.generate_content(
+        model=MODEL,
+        contents=build_contents(path),
+        config=build_generate_content_config(),
+    )
+    text = response.text or ""
+    write_cached_response(path, text)
+    return text
+
+async def agenerate_many(paths):
+    """Generate Mermaid code for several JSON files concurrently."""
+    return await asyncio.gather(*(agenerate(path) for path in paths))
 
 if __name__ == "__main__":
     generate()